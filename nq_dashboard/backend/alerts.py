@@ -1,51 +1,106 @@
-"""Email alerts via Resend API — signal entry, exit, and daily summary."""
+"""Email alerts via the Resend REST API — signal entry, exit, and daily summary."""
 
+import asyncio
 import logging
 
-import resend
+import httpx
 
 from dashboard_config import RESEND_API_KEY, EMAIL_RECIPIENT
 
 logger = logging.getLogger(__name__)
 
+BATCH_WINDOW = 0.2  # seconds — alerts queued within this window share one request
+RESEND_API_URL = "https://api.resend.com"
+RESEND_TIMEOUT = 10  # seconds
+
+# HTML bodies are built once at import and rendered per alert with
+# str.format_map().
+_SIGNAL_HTML = """\
+<div style="font-family: 'Courier New', monospace; background: #0a0e17; color: #e5e7eb; padding: 20px; border-radius: 8px;">
+    <h2 style="color: #10b981; margin-top: 0;">NQ LONG SIGNAL</h2>
+    <hr style="border-color: #374151;">
+    <table style="width: 100%; color: #e5e7eb;">
+        <tr><td style="color: #9ca3af;">Score:</td><td><strong>{long_score:.1f}</strong> / {long_threshold:.1f}</td></tr>
+        <tr><td style="color: #9ca3af;">Price:</td><td><strong>{close:,.1f}</strong></td></tr>
+        <tr><td style="color: #9ca3af;">ATR%:</td><td>{atr_percentile:.0f}%</td></tr>
+        <tr><td style="color: #9ca3af;">SL:</td><td style="color: #ef4444;">{sl_price:,.1f} (-{sl_distance:.0f}pts)</td></tr>
+        <tr><td style="color: #9ca3af;">TP1:</td><td style="color: #10b981;">{tp1_price:,.1f} (+{tp1_distance:.0f}pts)</td></tr>
+        <tr><td style="color: #9ca3af;">Session:</td><td>{session}</td></tr>
+    </table>
+    <hr style="border-color: #374151;">
+    <p style="color: #6b7280; font-size: 12px;">Paper Trade - NQ Swing Scalper B1</p>
+</div>
+"""
+
+_EXIT_HTML = """\
+<div style="font-family: 'Courier New', monospace; background: #0a0e17; color: #e5e7eb; padding: 20px; border-radius: 8px;">
+    <h2 style="color: {pnl_color}; margin-top: 0;">TRADE CLOSED</h2>
+    <hr style="border-color: #374151;">
+    <table style="width: 100%; color: #e5e7eb;">
+        <tr><td style="color: #9ca3af;">Exit Reason:</td><td><strong>{exit_reason}</strong></td></tr>
+        <tr><td style="color: #9ca3af;">P&L:</td><td style="color: {pnl_color};"><strong>${pnl:,.0f}</strong></td></tr>
+        <tr><td style="color: #9ca3af;">Entry:</td><td>{entry_price:,.1f}</td></tr>
+        <tr><td style="color: #9ca3af;">Exit:</td><td>{exit_price:,.1f}</td></tr>
+        <tr><td style="color: #9ca3af;">TP1 Hit:</td><td>{tp1_hit_label}</td></tr>
+        <tr><td style="color: #9ca3af;">Trail Stage:</td><td>S{trail_stage}</td></tr>
+    </table>
+    <hr style="border-color: #374151;">
+    <p style="color: #6b7280; font-size: 12px;">Paper Trade - NQ Swing Scalper B1</p>
+</div>
+"""
+
+_DAILY_HTML = """\
+<div style="font-family: 'Courier New', monospace; background: #0a0e17; color: #e5e7eb; padding: 20px; border-radius: 8px;">
+    <h2 style="color: #3b82f6; margin-top: 0;">Daily Summary</h2>
+    <hr style="border-color: #374151;">
+    <table style="width: 100%; color: #e5e7eb;">
+        <tr><td style="color: #9ca3af;">Today P&L:</td><td><strong>${today_pnl:,.0f}</strong></td></tr>
+        <tr><td style="color: #9ca3af;">Today Trades:</td><td>{today_trades}</td></tr>
+        <tr><td style="color: #9ca3af;">Total P&L:</td><td>${total_pnl:,.0f}</td></tr>
+        <tr><td style="color: #9ca3af;">Win Rate:</td><td>{win_rate:.1f}%</td></tr>
+        <tr><td style="color: #9ca3af;">Profit Factor:</td><td>{pf:.2f}</td></tr>
+        <tr><td style="color: #9ca3af;">Total Trades:</td><td>{total_trades}</td></tr>
+        <tr><td style="color: #9ca3af;">Current DD:</td><td>${max_dd:,.0f}</td></tr>
+    </table>
+    <p style="color: #6b7280; font-size: 12px;">Paper Trade - NQ Swing Scalper B1</p>
+</div>
+"""
+
+
+class _TemplateContext(dict):
+    """Template context that renders missing numeric fields as 0."""
+
+    def __missing__(self, key):
+        return 0
+
 
 class EmailAlert:
     def __init__(self):
         self.enabled = bool(RESEND_API_KEY)
+        # One pooled HTTP/2 connection to Resend, reused for every alert.
+        self._client: httpx.AsyncClient | None = None
         if self.enabled:
-            resend.api_key = RESEND_API_KEY
+            self._client = httpx.AsyncClient(
+                base_url=RESEND_API_URL,
+                headers={"Authorization": f"Bearer {RESEND_API_KEY}"},
+                http2=True,
+                timeout=RESEND_TIMEOUT,
+            )
         self.recipient = EMAIL_RECIPIENT
         self.from_email = "NQ Scalper <onboarding@resend.dev>"
+        self._queue: list[dict] = []
+        self._flush_task: asyncio.Task | None = None
 
     async def send_signal(self, signal_data: dict):
         if not self.enabled:
             logger.info("Email alerts disabled (no API key)")
             return
 
-        sl_price = signal_data.get("sl_price", 0)
-        tp1_price = signal_data.get("tp1_price", 0)
-        close = signal_data.get("close", 0)
-        sl_distance = signal_data.get("sl_distance", 0)
-        tp1_distance = signal_data.get("tp1_distance", 0)
-
-        subject = f"NQ LONG SIGNAL - Score {signal_data.get('long_score', 0):.1f}"
-
-        html = f"""
-        <div style="font-family: 'Courier New', monospace; background: #0a0e17; color: #e5e7eb; padding: 20px; border-radius: 8px;">
-            <h2 style="color: #10b981; margin-top: 0;">NQ LONG SIGNAL</h2>
-            <hr style="border-color: #374151;">
-            <table style="width: 100%; color: #e5e7eb;">
-                <tr><td style="color: #9ca3af;">Score:</td><td><strong>{signal_data.get('long_score', 0):.1f}</strong> / {signal_data.get('long_threshold', 0):.1f}</td></tr>
-                <tr><td style="color: #9ca3af;">Price:</td><td><strong>{close:,.1f}</strong></td></tr>
-                <tr><td style="color: #9ca3af;">ATR%:</td><td>{signal_data.get('atr_percentile', 0):.0f}%</td></tr>
-                <tr><td style="color: #9ca3af;">SL:</td><td style="color: #ef4444;">{sl_price:,.1f} (-{sl_distance:.0f}pts)</td></tr>
-                <tr><td style="color: #9ca3af;">TP1:</td><td style="color: #10b981;">{tp1_price:,.1f} (+{tp1_distance:.0f}pts)</td></tr>
-                <tr><td style="color: #9ca3af;">Session:</td><td>{signal_data.get('session', 'US')}</td></tr>
-            </table>
-            <hr style="border-color: #374151;">
-            <p style="color: #6b7280; font-size: 12px;">Paper Trade - NQ Swing Scalper B1</p>
-        </div>
-        """
+        ctx = _TemplateContext(signal_data)
+        ctx.setdefault("session", "US")
+
+        subject = f"NQ LONG SIGNAL - Score {ctx['long_score']:.1f}"
+        html = _SIGNAL_HTML.format_map(ctx)
 
         await self._send(subject, html)
 
@@ -59,22 +114,13 @@ class EmailAlert:
         result = "WIN" if is_win else "LOSS"
         subject = f"NQ TRADE {result} - ${pnl:,.0f} ({trade.get('exit_reason', '')})"
 
-        html = f"""
-        <div style="font-family: 'Courier New', monospace; background: #0a0e17; color: #e5e7eb; padding: 20px; border-radius: 8px;">
-            <h2 style="color: {pnl_color}; margin-top: 0;">TRADE CLOSED</h2>
-            <hr style="border-color: #374151;">
-            <table style="width: 100%; color: #e5e7eb;">
-                <tr><td style="color: #9ca3af;">Exit Reason:</td><td><strong>{trade.get('exit_reason', '')}</strong></td></tr>
-                <tr><td style="color: #9ca3af;">P&L:</td><td style="color: {pnl_color};"><strong>${pnl:,.0f}</strong></td></tr>
-                <tr><td style="color: #9ca3af;">Entry:</td><td>{trade.get('entry_price', 0):,.1f}</td></tr>
-                <tr><td style="color: #9ca3af;">Exit:</td><td>{trade.get('exit_price', 0):,.1f}</td></tr>
-                <tr><td style="color: #9ca3af;">TP1 Hit:</td><td>{'Yes' if trade.get('tp1_hit') else 'No'}</td></tr>
-                <tr><td style="color: #9ca3af;">Trail Stage:</td><td>S{trade.get('trail_stage', 0)}</td></tr>
-            </table>
-            <hr style="border-color: #374151;">
-            <p style="color: #6b7280; font-size: 12px;">Paper Trade - NQ Swing Scalper B1</p>
-        </div>
-        """
+        ctx = _TemplateContext(trade)
+        ctx.setdefault("exit_reason", "")
+        ctx["pnl"] = pnl
+        ctx["pnl_color"] = pnl_color
+        ctx["tp1_hit_label"] = "Yes" if trade.get("tp1_hit") else "No"
+
+        html = _EXIT_HTML.format_map(ctx)
 
         await self._send(subject, html)
 
@@ -83,35 +129,56 @@ class EmailAlert:
             return
 
         subject = f"NQ Daily Summary - ${stats.get('today_pnl', 0):,.0f} today"
-
-        html = f"""
-        <div style="font-family: 'Courier New', monospace; background: #0a0e17; color: #e5e7eb; padding: 20px; border-radius: 8px;">
-            <h2 style="color: #3b82f6; margin-top: 0;">Daily Summary</h2>
-            <hr style="border-color: #374151;">
-            <table style="width: 100%; color: #e5e7eb;">
-                <tr><td style="color: #9ca3af;">Today P&L:</td><td><strong>${stats.get('today_pnl', 0):,.0f}</strong></td></tr>
-                <tr><td style="color: #9ca3af;">Today Trades:</td><td>{stats.get('today_trades', 0)}</td></tr>
-                <tr><td style="color: #9ca3af;">Total P&L:</td><td>${stats.get('total_pnl', 0):,.0f}</td></tr>
-                <tr><td style="color: #9ca3af;">Win Rate:</td><td>{stats.get('win_rate', 0):.1f}%</td></tr>
-                <tr><td style="color: #9ca3af;">Profit Factor:</td><td>{stats.get('pf', 0):.2f}</td></tr>
-                <tr><td style="color: #9ca3af;">Total Trades:</td><td>{stats.get('total_trades', 0)}</td></tr>
-                <tr><td style="color: #9ca3af;">Current DD:</td><td>${stats.get('max_dd', 0):,.0f}</td></tr>
-            </table>
-            <p style="color: #6b7280; font-size: 12px;">Paper Trade - NQ Swing Scalper B1</p>
-        </div>
-        """
+        html = _DAILY_HTML.format_map(_TemplateContext(stats))
 
         await self._send(subject, html)
 
     async def _send(self, subject: str, html_body: str):
+        """Queue an email; queued emails go out together after BATCH_WINDOW."""
+        params = {
+            "from": self.from_email,
+            "to": [self.recipient],
+            "subject": subject,
+            "html": html_body,
+        }
+        self._queue.append(params)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self):
+        """Send any queued emails immediately (e.g. on shutdown)."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._flush()
+
+    async def close(self):
+        """Flush pending emails and release the Resend connection."""
+        await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _flush_later(self):
+        await asyncio.sleep(BATCH_WINDOW)
+        self._flush_task = None
+        await self._flush()
+
+    async def _flush(self):
+        batch, self._queue = self._queue, []
+        if not batch or self._client is None:
+            return
         try:
-            params: resend.Emails.SendParams = {
-                "from": self.from_email,
-                "to": [self.recipient],
-                "subject": subject,
-                "html": html_body,
-            }
-            email = resend.Emails.send(params)
-            logger.info("Email sent: %s (id: %s)", subject, email.get("id"))
+            if len(batch) == 1:
+                resp = await self._client.post("/emails", json=batch[0])
+                resp.raise_for_status()
+                logger.info("Email sent: %s (id: %s)", batch[0]["subject"], resp.json().get("id"))
+            else:
+                resp = await self._client.post("/emails/batch", json=batch)
+                resp.raise_for_status()
+                logger.info(
+                    "Email batch sent: %s",
+                    ", ".join(p["subject"] for p in batch),
+                )
         except Exception as e:
             logger.error("Email failed: %s", e)
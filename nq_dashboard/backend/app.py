@@ -2,26 +2,30 @@
 
 import asyncio
 import logging
-import math
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 
+import orjson
 import pandas as pd
-from ta.trend import EMAIndicator
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from starlette.websockets import WebSocketState
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 
-from dashboard_config import HOST, PORT, INITIAL_CAPITAL, TICKER
-from data_feed import DataFeed, fetch_5m_candles
+from dashboard_config import HOST, PORT, INITIAL_CAPITAL, TICK_SIZE
+from data_feed import DataFeed
 from indicator_engine import IndicatorEngine
-from paper_trader import PaperTrader
+from paper_trader import PaperTrader, serialize_trade, warm_up_jit
 from database import Database
 from alerts import EmailAlert
 from scheduler import TradingScheduler
+from candles import df_to_candles, resample_df, load_5m_candles
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,30 +33,141 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# DataFeed.get_dataframe() hands out shallow copies of one shared frame.
+pd.set_option("mode.copy_on_write", True)
+
 # Global state
 data_feed = DataFeed()
 engine = IndicatorEngine()
 paper_trader = PaperTrader(initial_capital=INITIAL_CAPITAL)
 db = Database()
 alerts = EmailAlert()
-ws_clients: set[WebSocket] = set()
+ws_clients: dict[WebSocket, asyncio.Queue] = {}
 trading_scheduler: TradingScheduler | None = None
 last_signal_data: dict | None = None
 
+WORKER_THREADS = 4  # default executor; runs the indicator pipeline off the loop
+STATE_PUSH_INTERVAL = 10  # seconds
+CLIENT_QUEUE_SIZE = 4  # snapshots buffered per client before the oldest is dropped
+STATE_CACHE_TTL = 5  # seconds
+_state_snapshot: dict[str, bytes] | None = None
+_state_snapshot_ts: float = 0
+# Last snapshot sent to each client, so later frames only carry what changed.
+_last_sent: dict[WebSocket, dict[str, bytes]] = {}
+# Encoded frames keyed by (id(prev), id(snapshot)); clients that are in step
+# share one encoding. Values pin both dicts so the ids stay valid.
+_frame_cache: dict[tuple[int, int], tuple[dict | None, dict, str]] = {}
+
+CANDLES_CACHE_TTL = 30  # seconds — matches the live-price refresh of the forming bar
+CANDLES_CACHE_SIZE = 8
+NDJSON_CHUNK_ROWS = 100  # candles per streamed chunk
+_candles_cache: OrderedDict[tuple, tuple[float, bytes]] = OrderedDict()
+
 
 async def broadcast_state():
     """Push current state to all connected WebSocket clients."""
+    # Called by the scheduler after every tick, so bar data may have changed.
+    _candles_cache.clear()
+    invalidate_state_cache()
+    push_state()
+
+
+def push_state() -> None:
+    """Queue the current snapshot for every client's writer task.
+
+    A slow client only backs up its own queue; when that is full the oldest
+    snapshot is dropped, which is safe because frames are diffed against
+    what was actually sent.
+    """
     if not ws_clients:
         return
+    snapshot = get_state_snapshot()
+    for ws, queue in list(ws_clients.items()):
+        if ws.client_state is not WebSocketState.CONNECTED:
+            _drop_client(ws)
+            continue
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(snapshot)
+
+
+async def _push_loop():
+    """Periodic push so live price and stats refresh between scheduler ticks."""
+    while True:
+        await asyncio.sleep(STATE_PUSH_INTERVAL)
+        if not ws_clients:
+            continue
+        await data_feed.refresh_live_price()
+        push_state()
+
+
+def _drop_client(ws: WebSocket) -> None:
+    ws_clients.pop(ws, None)
+    _last_sent.pop(ws, None)
+
+
+def get_state_snapshot(max_age: float = STATE_CACHE_TTL) -> dict[str, bytes]:
+    """Return the state snapshot as JSON-encoded top-level values.
+
+    Rebuilt at most every *max_age* s and shared by all clients, so the
+    per-interval cost is independent of the number of connections.
+    """
+    global _state_snapshot, _state_snapshot_ts
+    now = time.monotonic()
+    if _state_snapshot is None or now - _state_snapshot_ts >= max_age:
+        state = get_current_state()
+        state.pop("type")
+        _state_snapshot = {
+            key: orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+            for key, value in state.items()
+        }
+        _state_snapshot_ts = now
+        _frame_cache.clear()
+    return _state_snapshot
 
-    state = get_current_state()
-    dead = set()
-    for ws in ws_clients:
-        try:
-            await ws.send_json(state)
-        except Exception:
-            dead.add(ws)
-    ws_clients -= dead
+
+def invalidate_state_cache() -> None:
+    """Force the next get_state_snapshot() call to rebuild the snapshot."""
+    global _state_snapshot
+    _state_snapshot = None
+
+
+def next_frame(ws: WebSocket, snapshot: dict[str, bytes]) -> str:
+    """Build the text frame that brings *ws* up to *snapshot*.
+
+    The first frame is a full ``state_update``; after that only the keys
+    that changed since the last frame are sent as ``state_diff``, or a bare
+    ``heartbeat`` when nothing but the timestamp moved.
+    """
+    prev = _last_sent.get(ws)
+    _last_sent[ws] = snapshot
+    key = (id(prev), id(snapshot))
+    cached = _frame_cache.get(key)
+    if cached is None:
+        cached = _frame_cache[key] = (prev, snapshot, _build_frame(prev, snapshot))
+    return cached[2]
+
+
+def _build_frame(prev: dict[str, bytes] | None, snapshot: dict[str, bytes]) -> str:
+    """Encode the frame that takes a client from *prev* to *snapshot*."""
+    if prev is None:
+        return _encode_frame("state_update", snapshot)
+
+    changed = {
+        key: value for key, value in snapshot.items()
+        if key != "timestamp" and prev.get(key) != value
+    }
+    if not changed:
+        return _encode_frame("heartbeat", {"timestamp": snapshot["timestamp"]})
+    changed["timestamp"] = snapshot["timestamp"]
+    return _encode_frame("state_diff", changed)
+
+
+def _encode_frame(frame_type: str, fields: dict[str, bytes]) -> str:
+    """Join pre-encoded values into a JSON object with a ``type`` tag."""
+    parts = [b'"type":' + orjson.dumps(frame_type)]
+    parts.extend(orjson.dumps(key) + b":" + value for key, value in fields.items())
+    return (b"{" + b",".join(parts) + b"}").decode()
 
 
 def get_current_state() -> dict:
@@ -78,6 +193,12 @@ async def lifespan(app: FastAPI):
 
     logger.info("Starting NQ Dashboard...")
 
+    # A small, named pool instead of asyncio's cpu_count+4 default; every
+    # asyncio.to_thread() call in the app lands here.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="nq-worker")
+    )
+
     # Restore capital from DB
     saved_capital = db.get_state("capital")
     if saved_capital:
@@ -90,13 +211,18 @@ async def lifespan(app: FastAPI):
     paper_trader.trade_count = len(closed_trades)
     logger.info("Restored %d trades from database", len(closed_trades))
 
+    # Compile numba helpers while the history download is in flight
+    jit_warmup = asyncio.create_task(asyncio.to_thread(warm_up_jit))
+
     # Initialize data feed
     await data_feed.initialize()
+    await data_feed.refresh_live_price()
+    await jit_warmup
 
     # Run initial indicator pass
     df = data_feed.get_dataframe()
     if not df.empty:
-        last_signal_data = engine.process(df)
+        last_signal_data = await asyncio.to_thread(engine.process, df)
         if last_signal_data:
             logger.info(
                 "Initial signal: score=%.1f thresh=%.1f signal=%s",
@@ -115,18 +241,26 @@ async def lifespan(app: FastAPI):
         broadcast_fn=broadcast_state,
     )
     trading_scheduler.start()
+    push_task = asyncio.create_task(_push_loop())
 
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    push_task.cancel()
     if trading_scheduler:
         trading_scheduler.stop()
+    await alerts.close()
+    await data_feed.close()
     db.set_state("capital", str(paper_trader.capital))
     db.close()
 
 
-app = FastAPI(title="NQ Swing Scalper Dashboard", lifespan=lifespan)
+app = FastAPI(
+    title="NQ Swing Scalper Dashboard",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -142,26 +276,34 @@ app.add_middleware(
 @app.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket):
     await ws.accept()
-    ws_clients.add(ws)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+    queue.put_nowait(get_state_snapshot())
+    ws_clients[ws] = queue
     logger.info("WebSocket client connected (%d total)", len(ws_clients))
+    writer = asyncio.create_task(_client_writer(ws, queue))
     try:
-        # Send initial state
-        await ws.send_json(get_current_state())
-        # Keep alive and push updates
+        # Pushes come from the writer; here we only drain pings until disconnect.
         while True:
-            # Wait for pings or client messages
-            try:
-                await asyncio.wait_for(ws.receive_text(), timeout=10)
-            except asyncio.TimeoutError:
-                # Push state periodically
-                await ws.send_json(get_current_state())
+            await ws.receive_text()
     except WebSocketDisconnect:
         pass
     finally:
-        ws_clients.discard(ws)
+        writer.cancel()
+        _drop_client(ws)
         logger.info("WebSocket client disconnected (%d remaining)", len(ws_clients))
 
 
+async def _client_writer(ws: WebSocket, queue: asyncio.Queue):
+    """Send queued snapshots to one client, in order."""
+    try:
+        while True:
+            snapshot = await queue.get()
+            await ws.send_text(next_frame(ws, snapshot))
+    except Exception as e:
+        logger.debug("WebSocket send failed: %s", e)
+        _drop_client(ws)
+
+
 # ─── REST Endpoints ──────────────────────────────────────────
 
 @app.get("/health")
@@ -177,11 +319,70 @@ async def health():
 
 
 @app.get("/api/candles")
-async def get_candles(limit: int = 200, interval: str = "15m"):
-    """Return last N candles, optionally resampled to a different timeframe."""
-
+async def get_candles(
+    limit: int = 200,
+    interval: str = "15m",
+    fmt: str = Query("ticks", alias="format"),
+):
+    """Return last N candles, optionally resampled to a different timeframe.
+
+    Prices are sent as integer multiples of ``tick_scale``.  ``?format=ndjson``
+    streams the same data as newline-delimited JSON (a ``tick_scale`` header
+    line, then one candle per line); ``?format=float`` returns the legacy
+    bare list with float prices.
+    """
+    ticks = fmt != "float"
+    ndjson = fmt == "ndjson"
+    media_type = "application/x-ndjson" if ndjson else "application/json"
+    key = (interval, limit, fmt, data_feed.last_update)
+    now = time.monotonic()
+    cached = _candles_cache.get(key)
+    if cached is not None and now - cached[0] < CANDLES_CACHE_TTL:
+        _candles_cache.move_to_end(key)
+        return Response(content=cached[1], media_type=media_type)
+
+    candles = await _build_candles(limit, interval, ticks)
+    if ndjson:
+        return StreamingResponse(_stream_ndjson(key, now, candles), media_type=media_type)
+
+    body = {"tick_scale": TICK_SIZE, "candles": candles} if ticks else candles
+    payload = orjson.dumps(body)
+    if candles:
+        _cache_candles(key, now, payload)
+    return Response(content=payload, media_type=media_type)
+
+
+def _cache_candles(key: tuple, now: float, payload: bytes) -> None:
+    _candles_cache[key] = (now, payload)
+    _candles_cache.move_to_end(key)
+    while len(_candles_cache) > CANDLES_CACHE_SIZE:
+        _candles_cache.popitem(last=False)
+
+
+async def _stream_ndjson(key: tuple, now: float, candles: list):
+    """Yield *candles* as NDJSON in chunks, caching the full body once sent.
+
+    Async so Starlette iterates it on the event loop: no threadpool hop per
+    chunk, and the _candles_cache write stays on the loop thread.
+    """
+    chunks = [orjson.dumps({"tick_scale": TICK_SIZE}) + b"\n"]
+    yield chunks[0]
+    for i in range(0, len(candles), NDJSON_CHUNK_ROWS):
+        chunk = b"".join(
+            orjson.dumps(c) + b"\n" for c in candles[i:i + NDJSON_CHUNK_ROWS]
+        )
+        chunks.append(chunk)
+        yield chunk
+    if candles:
+        _cache_candles(key, now, b"".join(chunks))
+
+
+async def _build_candles(limit: int, interval: str, ticks: bool) -> list:
     if interval == "5m":
-        return await _fetch_5m_candles(limit)
+        try:
+            return await load_5m_candles(data_feed, limit, ticks)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="5m candle fetch timed out")
 
     df = data_feed.get_dataframe()
     if df.empty:
@@ -189,85 +390,22 @@ async def get_candles(limit: int = 200, interval: str = "15m"):
 
     if interval == "15m":
         # Default: run full indicator pipeline
-        enriched = engine.process_full(df)
+        enriched = await asyncio.to_thread(engine.get_enriched, df)
         if enriched is None or enriched.empty:
-            return _df_to_candles(df.tail(limit))
-        return _df_to_candles(enriched.tail(limit), enriched=True)
+            return df_to_candles(df.tail(limit), ticks=ticks)
+        return df_to_candles(enriched.tail(limit), enriched=True, ticks=ticks)
 
     if interval == "1h":
-        resampled = _resample_df(df, "1h")
-        return _df_to_candles(resampled.tail(limit), enriched=True)
+        resampled = resample_df(df, "1h")
+        return df_to_candles(resampled.tail(limit), enriched=True, ticks=ticks)
 
     return []
 
 
-def _resample_df(df: pd.DataFrame, interval: str) -> pd.DataFrame:
-    """Resample 15m data to a larger timeframe and add basic indicators."""
-    rule = {"30m": "30min", "1h": "1h", "4h": "4h"}.get(interval, "1h")
-
-    ohlcv = df.resample(rule).agg({
-        "Open": "first",
-        "High": "max",
-        "Low": "min",
-        "Close": "last",
-        "Volume": "sum",
-    }).dropna(subset=["Close"])
-
-    # Compute basic indicators on resampled data
-    if len(ohlcv) >= 50:
-        ohlcv["ema50"] = EMAIndicator(ohlcv["Close"], window=50).ema_indicator()
-    if len(ohlcv) >= 200:
-        ohlcv["ema200"] = EMAIndicator(ohlcv["Close"], window=200).ema_indicator()
-
-    return ohlcv
-
-
-async def _fetch_5m_candles(limit: int) -> list:
-    """Fetch 5m candles on-demand (last 5 trading days)."""
-    try:
-        loop = asyncio.get_event_loop()
-        df = await loop.run_in_executor(None, fetch_5m_candles, TICKER)
-        if df.empty:
-            return []
-
-        # Add basic EMAs
-        if len(df) >= 50:
-            df["ema50"] = EMAIndicator(df["Close"], window=50).ema_indicator()
-        if len(df) >= 200:
-            df["ema200"] = EMAIndicator(df["Close"], window=200).ema_indicator()
-
-        return _df_to_candles(df.tail(limit), enriched=True)
-    except Exception as e:
-        logger.error("5m fetch failed: %s", e)
-        return []
-
-
-def _df_to_candles(df: pd.DataFrame, enriched: bool = False) -> list:
-    """Convert a DataFrame to the candle JSON format."""
-    candles = []
-    for ts, row in df.iterrows():
-        c = {
-            "time": int(ts.timestamp()),
-            "open": round(float(row["Open"]), 2),
-            "high": round(float(row["High"]), 2),
-            "low": round(float(row["Low"]), 2),
-            "close": round(float(row["Close"]), 2),
-            "volume": int(row["Volume"]),
-        }
-        if enriched:
-            c["ema50"] = round(float(row["ema50"]), 2) if not _is_nan(row.get("ema50")) else None
-            c["ema200"] = round(float(row["ema200"]), 2) if not _is_nan(row.get("ema200")) else None
-            c["supertrend"] = round(float(row["st_line"]), 2) if not _is_nan(row.get("st_line")) else None
-            c["st_bullish"] = bool(row.get("st_bullish", False))
-            c["vwap"] = round(float(row["vwap"]), 2) if not _is_nan(row.get("vwap")) else None
-        candles.append(c)
-    return candles
-
-
 @app.get("/api/trades")
 async def get_trades():
     """Return trade history from paper trader."""
-    return paper_trader.trade_history
+    return [serialize_trade(t) for t in paper_trader.trade_history]
 
 
 @app.get("/api/stats")
@@ -297,15 +435,6 @@ async def get_signals_log(limit: int = 50):
     return db.get_recent_signals(limit)
 
 
-def _is_nan(val) -> bool:
-    if val is None:
-        return True
-    try:
-        return math.isnan(float(val))
-    except (ValueError, TypeError):
-        return True
-
-
 # ─── Reports Static Files ────────────────────────────────────
 
 REPORTS_DIR = Path(__file__).resolve().parent.parent / "reports"
@@ -327,5 +456,13 @@ if FRONTEND_DIR.is_dir():
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
-    uvicorn.run("app:app", host=HOST, port=PORT, reload=True)
+    # uvloop has no Windows build; fall back to the stock asyncio loop there.
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    # State frames are JSON with repeated keys, so permessage-deflate pays off.
+    uvicorn.run(
+        "app:app", host=HOST, port=PORT,
+        loop=loop, http="httptools", ws="websockets",
+        ws_per_message_deflate=True,
+    )
@@ -0,0 +1,118 @@
+"""Candle helpers for the chart API — resampling, 5m fetches, JSON conversion."""
+
+import asyncio
+import logging
+
+import pandas as pd
+from ta.trend import EMAIndicator
+
+from dashboard_config import TICK_SIZE
+from data_feed import DataFeed
+
+logger = logging.getLogger(__name__)
+
+FETCH_5M_TIMEOUT = 10  # seconds
+
+
+def resample_df(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Resample 15m data to a larger timeframe and add basic indicators."""
+    rule = {"30m": "30min", "1h": "1h", "4h": "4h"}.get(interval, "1h")
+
+    ohlcv = df.resample(rule).agg({
+        "Open": "first",
+        "High": "max",
+        "Low": "min",
+        "Close": "last",
+        "Volume": "sum",
+    }).dropna(subset=["Close"])
+
+    # Compute basic indicators on resampled data
+    if len(ohlcv) >= 50:
+        ohlcv["ema50"] = EMAIndicator(ohlcv["Close"], window=50).ema_indicator()
+    if len(ohlcv) >= 200:
+        ohlcv["ema200"] = EMAIndicator(ohlcv["Close"], window=200).ema_indicator()
+
+    return ohlcv
+
+
+async def load_5m_candles(feed: DataFeed, limit: int, ticks: bool = False) -> list:
+    """Fetch 5m candles on-demand (last 5 trading days).
+
+    Raises asyncio.TimeoutError if Yahoo doesn't answer within FETCH_5M_TIMEOUT.
+    """
+    try:
+        df = await asyncio.wait_for(feed.fetch_5m_candles(), timeout=FETCH_5M_TIMEOUT)
+        if df.empty:
+            return []
+
+        # Add basic EMAs
+        if len(df) >= 50:
+            df["ema50"] = EMAIndicator(df["Close"], window=50).ema_indicator()
+        if len(df) >= 200:
+            df["ema200"] = EMAIndicator(df["Close"], window=200).ema_indicator()
+
+        return df_to_candles(df.tail(limit), enriched=True, ticks=ticks)
+    except asyncio.TimeoutError:
+        logger.error("5m fetch timed out after %ds", FETCH_5M_TIMEOUT)
+        raise
+    except Exception as e:
+        logger.error("5m fetch failed: %s", e)
+        return []
+
+
+def df_to_candles(df: pd.DataFrame, enriched: bool = False, ticks: bool = False) -> list:
+    """Convert a DataFrame to the candle JSON format.
+
+    With *ticks*, prices are integer counts of TICK_SIZE instead of floats.
+    """
+    n = len(df)
+    if n == 0:
+        return []
+
+    price = _tick_column if ticks else _price_column
+    columns = {
+        "time": _epoch_seconds(df.index),
+        "open": price(df, "Open"),
+        "high": price(df, "High"),
+        "low": price(df, "Low"),
+        "close": price(df, "Close"),
+        "volume": df["Volume"].to_numpy(dtype="int64").tolist(),
+    }
+    if enriched:
+        columns["ema50"] = price(df, "ema50")
+        columns["ema200"] = price(df, "ema200")
+        columns["supertrend"] = price(df, "st_line")
+        columns["st_bullish"] = (
+            df["st_bullish"].fillna(False).astype(bool).tolist()
+            if "st_bullish" in df.columns else [False] * n
+        )
+        columns["vwap"] = price(df, "vwap")
+
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
+def _epoch_seconds(index: pd.DatetimeIndex) -> list:
+    """Unix seconds for every bar, in one vectorized pass.
+
+    Converting the unit first keeps this correct for indexes that aren't
+    stored in nanoseconds (e.g. after a parquet round-trip); tz-aware
+    indexes are already UTC-based in asi8.
+    """
+    return index.as_unit("s").asi8.tolist()
+
+
+def _price_column(df: pd.DataFrame, name: str) -> list:
+    """Values of *name* rounded to cents, NaN as None (all None if the column is missing)."""
+    if name not in df.columns:
+        return [None] * len(df)
+    col = df[name].astype(float).round(2)
+    return col.astype(object).where(col.notna(), None).tolist()
+
+
+def _tick_column(df: pd.DataFrame, name: str) -> list:
+    """Values of *name* as integer tick counts, NaN as None (all None if the column is missing)."""
+    if name not in df.columns:
+        return [None] * len(df)
+    col = (df[name].astype(float) / TICK_SIZE).round()
+    return col.astype("Int64").astype(object).where(col.notna(), None).tolist()
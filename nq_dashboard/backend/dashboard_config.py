@@ -1,6 +1,7 @@
 """Dashboard configuration — loads from .env, references nq_scalper config."""
 
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -11,6 +12,14 @@ BASE_DIR = Path(__file__).resolve().parent
 NQ_SCALPER_DIR = BASE_DIR.parent.parent / "nq_scalper"
 DB_PATH = str(BASE_DIR / "data" / "dashboard.db")
 
+# nq_scalper is a flat script directory whose modules import each other by
+# top-level name (e.g. `config`), so it goes on sys.path rather than being
+# imported as a package. Done once here for every backend module, right
+# after the backend's own entry (sys.path[0]) so backend modules such as
+# data_feed still shadow their nq_scalper namesakes.
+if str(NQ_SCALPER_DIR) not in sys.path:
+    sys.path.insert(1, str(NQ_SCALPER_DIR))
+
 # Email (Resend API)
 RESEND_API_KEY = os.getenv("RESEND_API_KEY", "")
 EMAIL_RECIPIENT = os.getenv("EMAIL_RECIPIENT", "ohadc55@gmail.com")
@@ -20,6 +29,7 @@ TICKER = "NQ=F"
 INTERVAL = "15m"
 FETCH_PERIOD = "60d"
 UPDATE_PERIOD = "1d"
+TICK_SIZE = 0.25  # NQ minimum price increment; candle prices are sent in ticks
 
 # Paper trading
 INITIAL_CAPITAL = 100_000.0
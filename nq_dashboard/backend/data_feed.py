@@ -10,8 +10,10 @@ import logging
 import time
 from datetime import datetime, timezone
 
+import httpx
+import numpy as np
+import orjson
 import pandas as pd
-import requests
 
 from dashboard_config import TICKER, INTERVAL, FETCH_PERIOD, UPDATE_PERIOD
 
@@ -23,6 +25,11 @@ RETRY_DELAY = 5  # seconds
 YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 
+# Short-lived response caches so back-to-back callers share one round-trip.
+QUOTE_CACHE_TTL = 5  # seconds
+_quote_cache: dict[str, tuple[float, dict]] = {}
+_candle_cache: dict[tuple[str, str, str], tuple[float, pd.DataFrame]] = {}
+
 # Yahoo v8 "range" values
 _PERIOD_TO_RANGE = {
     "1d": "1d",
@@ -44,11 +51,30 @@ _INTERVAL_MINUTES = {
     "30m": 30,
     "1h": 60,
 }
+_BAR_MINUTES = _INTERVAL_MINUTES.get(INTERVAL, 15)  # INTERVAL is fixed at import
 
 
 # ── Low-level fetchers ───────────────────────────────────────
 
-def _v8_fetch(symbol: str, period: str, interval: str) -> tuple[pd.DataFrame, dict]:
+def _new_client() -> httpx.AsyncClient:
+    """Keep-alive client for Yahoo — every request goes to the same host.
+
+    The transport retries failed connects itself, so a dropped keep-alive
+    connection or DNS blip doesn't cost a full RETRY_DELAY round in
+    _v8_fetch (and live quotes, which have no retry loop, get one too).
+    """
+    transport = httpx.AsyncHTTPTransport(
+        retries=MAX_RETRIES,
+        limits=httpx.Limits(
+            max_connections=4, max_keepalive_connections=4, keepalive_expiry=75
+        ),
+    )
+    return httpx.AsyncClient(headers=HEADERS, timeout=30, transport=transport)
+
+
+async def _v8_fetch(
+    client: httpx.AsyncClient, symbol: str, period: str, interval: str
+) -> tuple[pd.DataFrame, dict]:
     """Fetch candle data + meta from Yahoo v8 chart API with retry.
 
     Returns (DataFrame, meta_dict).  meta_dict contains the live quote
@@ -64,9 +90,9 @@ def _v8_fetch(symbol: str, period: str, interval: str) -> tuple[pd.DataFrame, di
 
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            r = requests.get(url, params=params, headers=HEADERS, timeout=30)
+            r = await client.get(url, params=params)
             r.raise_for_status()
-            data = r.json()
+            data = orjson.loads(r.content)
 
             results = data.get("chart", {}).get("result")
             if not results:
@@ -74,7 +100,7 @@ def _v8_fetch(symbol: str, period: str, interval: str) -> tuple[pd.DataFrame, di
                     "Yahoo v8 returned no result (attempt %d/%d)", attempt, MAX_RETRIES
                 )
                 if attempt < MAX_RETRIES:
-                    time.sleep(RETRY_DELAY)
+                    await asyncio.sleep(RETRY_DELAY)
                 continue
 
             result = results[0]
@@ -89,20 +115,27 @@ def _v8_fetch(symbol: str, period: str, interval: str) -> tuple[pd.DataFrame, di
 
             quote = result.get("indicators", {}).get("quote", [{}])[0]
 
-            # Build DataFrame — timestamps are UTC epoch seconds.
-            index = pd.to_datetime(timestamps, unit="s")
+            # Build DataFrame — timestamps are UTC epoch seconds.  Columns
+            # are typed arrays from the start (JSON null → NaN) and the
+            # missing-Close mask is applied once to all of them.
+            n = len(timestamps)
+            close = _float_array(quote.get("close"), n)
+            mask = ~np.isnan(close)
+            epoch = np.asarray(timestamps, dtype=np.int64)[mask]
+            index = pd.DatetimeIndex(
+                epoch.astype("datetime64[s]").astype("datetime64[ns]"), copy=False
+            )
+            volume = np.nan_to_num(_float_array(quote.get("volume"), n)[mask])
             df = pd.DataFrame(
                 {
-                    "Open": quote.get("open"),
-                    "High": quote.get("high"),
-                    "Low": quote.get("low"),
-                    "Close": quote.get("close"),
-                    "Volume": quote.get("volume"),
+                    "Open": _float_array(quote.get("open"), n)[mask],
+                    "High": _float_array(quote.get("high"), n)[mask],
+                    "Low": _float_array(quote.get("low"), n)[mask],
+                    "Close": close[mask],
+                    "Volume": volume.astype(np.int64),
                 },
                 index=index,
             )
-            df.dropna(subset=["Close"], inplace=True)
-            df["Volume"] = df["Volume"].fillna(0).astype(int)
 
             logger.info(
                 "Fetched %d bars via Yahoo v8 (attempt %d)", len(df), attempt
@@ -114,26 +147,53 @@ def _v8_fetch(symbol: str, period: str, interval: str) -> tuple[pd.DataFrame, di
                 "Yahoo v8 failed (attempt %d/%d): %s", attempt, MAX_RETRIES, e
             )
             if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY)
+                await asyncio.sleep(RETRY_DELAY)
 
     logger.error("All Yahoo v8 fetch attempts exhausted for %s", symbol)
     return pd.DataFrame(), {}
 
 
-def _fetch_candles(symbol: str, period: str, interval: str) -> pd.DataFrame:
-    """Convenience wrapper — returns only the DataFrame."""
-    df, _ = _v8_fetch(symbol, period, interval)
+def _float_array(values: list | None, n: int) -> np.ndarray:
+    """JSON number list → float64 array, with null (or a missing field) as NaN."""
+    if values is None:
+        return np.full(n, np.nan)
+    return np.array(values, dtype=np.float64)
+
+
+async def _fetch_candles(
+    client: httpx.AsyncClient, symbol: str, period: str, interval: str
+) -> pd.DataFrame:
+    """Convenience wrapper — returns only the DataFrame.
+
+    Results are reused for a quarter of the bar interval, which is well
+    inside the time before a new bar can appear.
+    """
+    key = (symbol, period, interval)
+    ttl = _INTERVAL_MINUTES.get(interval, 15) * 60 / 4
+    now = time.monotonic()
+    hit = _candle_cache.get(key)
+    if hit and now - hit[0] < ttl:
+        return hit[1].copy()
+
+    df, _ = await _v8_fetch(client, symbol, period, interval)
+    if not df.empty:
+        _candle_cache[key] = (now, df.copy())
     return df
 
 
-def _get_live_quote(symbol: str) -> dict | None:
+async def _get_live_quote(client: httpx.AsyncClient, symbol: str) -> dict | None:
     """Return ``{price, time}`` from Yahoo v8 meta (real-time quote)."""
+    now = time.monotonic()
+    hit = _quote_cache.get(symbol)
+    if hit and now - hit[0] < QUOTE_CACHE_TTL:
+        return hit[1]
+
     try:
         url = f"{YAHOO_CHART_URL}/{symbol}"
         params = {"range": "1d", "interval": "1d"}
-        r = requests.get(url, params=params, headers=HEADERS, timeout=10)
+        r = await client.get(url, params=params, timeout=10)
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         results = data.get("chart", {}).get("result")
         if not results:
             return None
@@ -142,25 +202,190 @@ def _get_live_quote(symbol: str) -> dict | None:
         mkt_time = meta.get("regularMarketTime")
         if price is None or mkt_time is None:
             return None
-        return {"price": float(price), "time": int(mkt_time)}
+        quote = {"price": float(price), "time": int(mkt_time)}
+        _quote_cache[symbol] = (now, quote)
+        return quote
     except Exception as e:
         logger.warning("Live quote fetch failed: %s", e)
         return None
 
 
-def fetch_5m_candles(symbol: str) -> pd.DataFrame:
+async def fetch_5m_candles(client: httpx.AsyncClient, symbol: str) -> pd.DataFrame:
     """Fetch 5-minute candles (max 5 trading days from Yahoo)."""
-    return _fetch_candles(symbol, "5d", "5m")
+    return await _fetch_candles(client, symbol, "5d", "5m")
+
+
+# ── Bar window ────────────────────────────────────────────────
+
+OHLCV = ("Open", "High", "Low", "Close", "Volume")
+
+
+class _BarRing:
+    """Fixed-capacity OHLCV window stored column-wise in NumPy arrays.
+
+    Bars are kept in time order starting at slot ``_start``; appending
+    writes into the next free slots (overwriting the oldest once full),
+    so a new bar never copies the history.  Overwrites of existing bars
+    are done in place.  ``version`` changes on every write.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.size = 0
+        self.version = 0
+        self._start = 0
+        self._ts = np.empty(capacity, dtype="datetime64[ns]")
+        self._cols = {
+            name: np.empty(capacity, dtype=np.int64 if name == "Volume" else np.float64)
+            for name in OHLCV
+        }
+
+    def _slots(self) -> np.ndarray:
+        return (self._start + np.arange(self.size)) % self.capacity
+
+    def _segments(self) -> list[tuple[int, int]]:
+        """Physical ``[lo, hi)`` runs holding the window, oldest first."""
+        end = self._start + self.size
+        if end <= self.capacity:
+            return [(self._start, end)]
+        return [(self._start, self.capacity), (0, end - self.capacity)]
+
+    def _find_slots(self, times: np.ndarray) -> np.ndarray:
+        """Slot of each of *times* in the window, or -1 where absent.
+
+        Binary-searches the (at most two) contiguous runs in place, so
+        locating a few overlapping bars allocates nothing window-sized.
+        """
+        found = np.full(len(times), -1, dtype=np.int64)
+        for lo, hi in self._segments():
+            run = self._ts[lo:hi]
+            pos = np.searchsorted(run, times)
+            hit = pos < len(run)
+            hit[hit] = run[pos[hit]] == times[hit]
+            found[hit] = lo + pos[hit]
+        return found
+
+    def _slot_of(self, ts: np.datetime64) -> int | None:
+        slot = int(self._find_slots(np.array([ts]))[0])
+        return None if slot < 0 else slot
+
+    @property
+    def last_time(self) -> pd.Timestamp | None:
+        if not self.size:
+            return None
+        return pd.Timestamp(self._ts[(self._start + self.size - 1) % self.capacity])
+
+    def load(self, df: pd.DataFrame) -> None:
+        """Replace the window with the last *capacity* rows of *df*."""
+        df = df.iloc[-self.capacity:]
+        n = len(df)
+        self._ts[:n] = df.index.as_unit("ns").values
+        for name, col in self._cols.items():
+            col[:n] = df[name].to_numpy()
+        self._start = 0
+        self.size = n
+        self.version += 1
+
+    def merge(self, df: pd.DataFrame) -> None:
+        """Insert or overwrite bars from *df*; later rows win on duplicates."""
+        df = df[~df.index.duplicated(keep="last")]
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        if not self.size:
+            self.load(df)
+            return
+
+        times = df.index.as_unit("ns").values
+        newer = times > self._ts[(self._start + self.size - 1) % self.capacity]
+        if not newer.all():
+            targets = self._find_slots(times[~newer])
+            if (targets < 0).any():
+                # A bar inside the window that we never had — rare enough
+                # to just rebuild.
+                merged = pd.concat([self.to_frame(), df])
+                self.load(merged[~merged.index.duplicated(keep="last")].sort_index())
+                return
+            for name, col in self._cols.items():
+                col[targets] = df[name].to_numpy()[~newer]
+            self.version += 1
+
+        n = int(newer.sum())
+        if n >= self.capacity:
+            self.load(df[newer])
+            return
+        targets = (self._start + self.size + np.arange(n)) % self.capacity
+        self._ts[targets] = times[newer]
+        for name, col in self._cols.items():
+            col[targets] = df[name].to_numpy()[newer]
+        self.size += n
+        if self.size > self.capacity:
+            self._start = (self._start + self.size - self.capacity) % self.capacity
+            self.size = self.capacity
+        self.version += 1
+
+    def upsert(self, ts: datetime, bar: dict) -> None:
+        """Write a single bar, appending or overwriting in place."""
+        t = np.datetime64(ts, "ns")
+        last = (self._start + self.size - 1) % self.capacity
+        if self.size and t == self._ts[last]:
+            slot = last
+        elif self.size and t < self._ts[last]:
+            slot = self._slot_of(t)
+            if slot is None:
+                self.merge(pd.DataFrame({k: [bar[k]] for k in OHLCV}, index=pd.DatetimeIndex([ts])))
+                return
+        else:
+            slot = (self._start + self.size) % self.capacity
+            if self.size == self.capacity:
+                self._start = (self._start + 1) % self.capacity
+            else:
+                self.size += 1
+            self._ts[slot] = t
+        for name, col in self._cols.items():
+            col[slot] = bar[name]
+        self.version += 1
+
+    def volume_at(self, ts: datetime) -> int | None:
+        slot = self._slot_of(np.datetime64(ts, "ns")) if self.size else None
+        return None if slot is None else int(self._cols["Volume"][slot])
+
+    def trim_before(self, cutoff: pd.Timestamp) -> None:
+        """Drop bars older than *cutoff* by advancing the start slot."""
+        t = np.datetime64(cutoff, "ns")
+        k = sum(int(np.searchsorted(self._ts[lo:hi], t)) for lo, hi in self._segments())
+        self._start = (self._start + k) % self.capacity
+        self.size -= k
+        self.version += 1
+
+    def last_bar(self) -> tuple[pd.Timestamp, dict] | None:
+        if not self.size:
+            return None
+        slot = (self._start + self.size - 1) % self.capacity
+        return pd.Timestamp(self._ts[slot]), {name: col[slot] for name, col in self._cols.items()}
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize the window (one gather per column)."""
+        slots = self._slots()
+        return pd.DataFrame(
+            {name: col[slots] for name, col in self._cols.items()},
+            index=pd.DatetimeIndex(self._ts[slots]),
+        )
 
 
 # ── DataFeed class ────────────────────────────────────────────
 
 LIVE_PRICE_CACHE_TTL = 30  # seconds
+HISTORY_DAYS = 60
+BAR_CLOSE_GRACE = 30  # seconds — start polling this long before the next bar is due
+# Room for HISTORY_DAYS of round-the-clock bars plus 10% slack.
+MAX_BARS = int(HISTORY_DAYS * 24 * 60 / _BAR_MINUTES * 1.1)
 
 
 class DataFeed:
     def __init__(self):
-        self.df = pd.DataFrame()
+        self._bars = _BarRing(MAX_BARS)
+        self._frame: pd.DataFrame | None = None
+        self._frame_version = -1
         self.last_update = None
         self.ticker = TICKER
         self._cached_price: float | None = None
@@ -170,17 +395,19 @@ class DataFeed:
         self._acc_open: float = 0
         self._acc_high: float = 0
         self._acc_low: float = 0
+        self._client = _new_client()
+
+    async def close(self):
+        """Close the pooled Yahoo connection."""
+        await self._client.aclose()
 
     async def initialize(self):
         """Fetch initial 60 days of 15m data for indicator warm-up."""
         logger.info("Fetching initial data for %s ...", self.ticker)
 
-        loop = asyncio.get_event_loop()
-        self.df = await loop.run_in_executor(
-            None, _fetch_candles, self.ticker, FETCH_PERIOD, INTERVAL
-        )
+        df = await _fetch_candles(self._client, self.ticker, FETCH_PERIOD, INTERVAL)
 
-        if self.df.empty:
+        if df.empty:
             logger.error(
                 "CRITICAL: No data returned for %s. "
                 "Dashboard will show no data until next successful fetch.",
@@ -188,15 +415,26 @@ class DataFeed:
             )
             return
 
-        self.last_update = self.df.index[-1]
-        logger.info("Loaded %d bars, last: %s", len(self.df), self.last_update)
+        self._bars.load(df)
+        self.last_update = df.index[-1]
+        logger.info("Loaded %d bars, last: %s", self._bars.size, self.last_update)
+
+    async def update(self, force: bool = False) -> int:
+        """Fetch latest bars since last update.  Returns count of new bars.
+
+        Skips the request (returning 0) while the bar after ``last_update``
+        can't have started yet, unless *force* is set.
+        """
+        if not force and self.last_update is not None:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            next_bar = self.last_update + pd.Timedelta(minutes=_BAR_MINUTES)
+            if now < next_bar - pd.Timedelta(seconds=BAR_CLOSE_GRACE):
+                logger.debug("Next bar not due until %s — skipping fetch", next_bar)
+                return 0
 
-    async def update(self) -> int:
-        """Fetch latest bars since last update.  Returns count of new bars."""
         try:
-            loop = asyncio.get_event_loop()
-            new_data = await loop.run_in_executor(
-                None, _fetch_candles, self.ticker, UPDATE_PERIOD, INTERVAL
+            new_data = await _fetch_candles(
+                self._client, self.ticker, UPDATE_PERIOD, INTERVAL
             )
         except Exception as e:
             logger.error("Failed to fetch update: %s", e)
@@ -207,28 +445,20 @@ class DataFeed:
             return await self._try_synthetic_bar()
 
         # If we had no data before, use the full fetch.
-        if self.df.empty:
-            self.df = new_data
-            self.last_update = self.df.index[-1]
-            logger.info("Recovered from empty state: loaded %d bars", len(self.df))
-            return len(self.df)
-
-        # Merge: concat + deduplicate.  Using keep="last" ensures that
-        # real candles overwrite earlier synthetic bars at the same time.
-        before = len(self.df)
-        combined = pd.concat([self.df, new_data])
-        combined = combined[~combined.index.duplicated(keep="last")]
-        combined.sort_index(inplace=True)
-        self.df = combined
-        self.last_update = self.df.index[-1]
-
-        # Keep last 60 days.
-        cutoff = self.last_update - pd.Timedelta(days=60)
-        self.df = self.df[self.df.index >= cutoff]
-
-        added = len(self.df) - before
+        if not self._bars.size:
+            self._bars.load(new_data)
+            self.last_update = new_data.index[-1]
+            logger.info("Recovered from empty state: loaded %d bars", self._bars.size)
+            return self._bars.size
+
+        # Yahoo returns bars in time order, so the new ones are a suffix.
+        added = len(new_data) - int(new_data.index.searchsorted(self.last_update, side="right"))
+        self._bars.merge(new_data)
+        self.last_update = max(self.last_update, new_data.index[-1])
+        self._bars.trim_before(self.last_update - pd.Timedelta(days=HISTORY_DAYS))
+
         if added > 0:
-            logger.info("Added %d new bars. Total: %d", added, len(self.df))
+            logger.info("Added %d new bars", added)
         else:
             # Candle API returned data but nothing new — check live quote.
             added = await self._try_synthetic_bar()
@@ -239,15 +469,14 @@ class DataFeed:
 
     def _bar_time_for(self, dt: datetime) -> datetime:
         """Floor *dt* to the nearest interval boundary."""
-        interval_min = _INTERVAL_MINUTES.get(INTERVAL, 15)
-        floored = dt.minute - (dt.minute % interval_min)
+        floored = dt.minute - (dt.minute % _BAR_MINUTES)
         return dt.replace(minute=floored, second=0, microsecond=0)
 
     def _accumulate_price(self, price: float, quote_epoch: int) -> None:
         """Feed a live price tick into the OHLC accumulator.
 
         If the price falls into a new bar window, the previous window is
-        flushed to self.df and a new accumulator window starts.
+        flushed to the bar window and a new accumulator window starts.
         """
         live_dt = datetime.fromtimestamp(
             quote_epoch, tz=timezone.utc
@@ -257,7 +486,7 @@ class DataFeed:
         if bar_time != self._acc_bar_time:
             # ── new window ──────────────────────────────────
             # Flush the old window into the DataFrame (if any).
-            if self._acc_bar_time is not None and not self.df.empty:
+            if self._acc_bar_time is not None and self._bars.size:
                 self._flush_accumulator()
 
             self._acc_bar_time = bar_time
@@ -271,34 +500,33 @@ class DataFeed:
 
         # Update the synthetic row in the DataFrame so the chart shows
         # the bar growing in real-time.
-        if self.df.empty or self.last_update is None:
-            return
-
-        # Don't overwrite real candles (those have Volume > 0).
-        if bar_time in self.df.index and int(self.df.at[bar_time, "Volume"]) > 0:
+        if not self._bars.size or self.last_update is None:
             return
 
         # Only create/update bars that are >= the last known bar time.
         if bar_time < self.last_update:
             return
 
-        self.df.loc[bar_time] = {
+        # Don't overwrite real candles (those have Volume > 0).
+        if (self._bars.volume_at(bar_time) or 0) > 0:
+            return
+
+        self._bars.upsert(bar_time, {
             "Open": self._acc_open,
             "High": self._acc_high,
             "Low": self._acc_low,
             "Close": price,
             "Volume": 0,
-        }
-        self.df.sort_index(inplace=True)
+        })
 
         if bar_time > self.last_update:
             self.last_update = bar_time
 
     def _flush_accumulator(self) -> None:
-        """Write the accumulated OHLC bar into self.df."""
+        """Write the accumulated OHLC bar into the bar window."""
         if self._acc_bar_time is None:
             return
-        # The bar is already in self.df (updated live), nothing extra to do.
+        # The bar is already queued (updated live), nothing extra to do.
 
     async def _try_synthetic_bar(self) -> int:
         """Create / update a synthetic candle from the Yahoo real-time quote.
@@ -306,14 +534,11 @@ class DataFeed:
         This covers holiday / abbreviated sessions where Yahoo returns a
         live ``regularMarketPrice`` but no new intraday candles.
         """
-        if self.df.empty:
+        if not self._bars.size:
             return 0
 
         try:
-            loop = asyncio.get_event_loop()
-            quote = await loop.run_in_executor(
-                None, _get_live_quote, self.ticker
-            )
+            quote = await _get_live_quote(self._client, self.ticker)
         except Exception:
             return 0
 
@@ -323,10 +548,8 @@ class DataFeed:
         old_last = self.last_update
         self._accumulate_price(quote["price"], quote["time"])
 
-        # Trim.
         if self.last_update and self.last_update != old_last:
-            cutoff = self.last_update - pd.Timedelta(days=60)
-            self.df = self.df[self.df.index >= cutoff]
+            self._bars.trim_before(self.last_update - pd.Timedelta(days=HISTORY_DAYS))
             logger.info(
                 "Synthetic bar at %s  O=%.2f H=%.2f L=%.2f C=%.2f",
                 self.last_update,
@@ -340,8 +563,8 @@ class DataFeed:
 
     # ── Live price (cached) ──────────────────────────────────
 
-    def get_live_price(self) -> float | None:
-        """Return the current market price, cached for 30 seconds.
+    async def refresh_live_price(self) -> float | None:
+        """Fetch the current market price unless the cached one is < 30 s old.
 
         As a side-effect, feeds every fresh price tick into the OHLC
         accumulator so synthetic bars develop proper High/Low spread.
@@ -350,7 +573,7 @@ class DataFeed:
         if now - self._cached_price_ts < LIVE_PRICE_CACHE_TTL and self._cached_price is not None:
             return self._cached_price
 
-        quote = _get_live_quote(self.ticker)
+        quote = await _get_live_quote(self._client, self.ticker)
         if quote:
             self._cached_price = quote["price"]
             self._cached_price_ts = now
@@ -358,17 +581,35 @@ class DataFeed:
             self._accumulate_price(quote["price"], quote["time"])
         return self._cached_price
 
+    def get_live_price(self) -> float | None:
+        """Return the last price fetched by refresh_live_price()."""
+        return self._cached_price
+
+    async def fetch_5m_candles(self) -> pd.DataFrame:
+        """On-demand 5m candles for the chart, over the shared connection."""
+        return await fetch_5m_candles(self._client, self.ticker)
+
     # ── Accessors ─────────────────────────────────────────────
 
     def get_dataframe(self) -> pd.DataFrame:
-        return self.df.copy()
+        """The bar window as a DataFrame, rebuilt only after the window changes.
+
+        Relies on pandas copy-on-write (enabled in app.py): callers get a
+        shallow copy, so adding columns or writing values never touches
+        the shared frame, and nothing is copied unless they do.
+        """
+        if self._frame is None or self._frame_version != self._bars.version:
+            self._frame = self._bars.to_frame()
+            self._frame_version = self._bars.version
+        return self._frame.copy(deep=False)
 
     def get_latest_bar(self) -> dict | None:
-        if self.df.empty:
+        latest = self._bars.last_bar()
+        if latest is None:
             return None
-        bar = self.df.iloc[-1]
+        ts, bar = latest
         return {
-            "timestamp": str(bar.name),
+            "timestamp": str(ts),
             "Open": float(bar["Open"]),
             "High": float(bar["High"]),
             "Low": float(bar["Low"]),
@@ -2,22 +2,102 @@
 
 import sqlite3
 import logging
-from datetime import datetime
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 from dashboard_config import DB_PATH
 
 logger = logging.getLogger(__name__)
 
+# Statements are module constants so every call passes the identical SQL
+# string and sqlite3's statement cache skips re-parsing.
+_TRADE_COLUMNS = (
+    "trade_num", "entry_time", "entry_price", "entry_score", "entry_session",
+    "sl_price", "sl_distance", "tp1_price", "tp1_distance",
+    "atr_at_entry", "atr_percentile",
+)
+_INSERT_TRADE_SQL = f"""
+    INSERT INTO trades ({", ".join(_TRADE_COLUMNS)}, status)
+    VALUES ({", ".join("?" * len(_TRADE_COLUMNS))}, 'OPEN')
+"""
+
+_CLOSE_TRADE_SQL = """
+    UPDATE trades SET
+        exit_time = ?, exit_price = ?, tp1_hit = ?, trail_stage = ?,
+        exit_reason = ?, pnl_tp1 = ?, pnl_runner = ?, costs = ?,
+        total_pnl = ?, capital_after = ?, status = 'CLOSED'
+    WHERE id = ?
+"""
+
+# updated_at is filled by the column default (CURRENT_TIMESTAMP, UTC).
+_SET_STATE_SQL = "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)"
+
+# signal_data keys, in signals_log column order (signal_triggered and
+# notes are appended separately).
+_SIGNAL_KEYS = (
+    "timestamp", "close", "long_score", "long_threshold", "atr",
+    "atr_percentile", "rsi", "adx", "session",
+)
+_LOG_SIGNAL_SQL = """
+    INSERT INTO signals_log (timestamp, close_price, long_score,
+        long_threshold, atr, atr_percentile, rsi, adx, session,
+        signal_triggered, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class Database:
     def __init__(self, db_path: str = DB_PATH):
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self.db_path = db_path
+        # One connection per thread: under WAL, readers on other threads
+        # don't queue behind a writer on a shared connection.
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
         self._create_tables()
         logger.info("Database initialized at %s", db_path)
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can run from the
+            # shutdown thread; each connection is otherwise thread-local.
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            # WAL + synchronous=NORMAL: commits append to the log without an
+            # fsync each time; durability is still kept across app crashes.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-20000")
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    def _commit(self):
+        """Commit now, unless the calling thread is inside batch()."""
+        if not getattr(self._local, "batch_depth", 0):
+            self.conn.commit()
+
+    @contextmanager
+    def batch(self):
+        """Defer this thread's commits to a single one when the block exits.
+
+        Writes made before an exception are still committed, matching what
+        the individual per-call commits would have left behind.
+        """
+        self._local.batch_depth = getattr(self._local, "batch_depth", 0) + 1
+        try:
+            yield self
+        finally:
+            self._local.batch_depth -= 1
+            self._commit()
+
     def _create_tables(self):
         self.conn.executescript("""
             CREATE TABLE IF NOT EXISTS trades (
@@ -66,41 +146,23 @@ class Database:
                 signal_triggered INTEGER DEFAULT 0,
                 notes TEXT
             );
+
+            CREATE INDEX IF NOT EXISTS ix_trades_status_exit
+                ON trades(status, exit_time DESC);
         """)
         self.conn.commit()
 
     # --- Trades ---
 
     def insert_trade(self, trade: dict) -> int:
-        cursor = self.conn.execute("""
-            INSERT INTO trades (trade_num, entry_time, entry_price, entry_score,
-                entry_session, sl_price, sl_distance, tp1_price, tp1_distance,
-                atr_at_entry, atr_percentile, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'OPEN')
-        """, (
-            trade.get("trade_num"),
-            trade.get("entry_time"),
-            trade.get("entry_price"),
-            trade.get("entry_score"),
-            trade.get("entry_session"),
-            trade.get("sl_price"),
-            trade.get("sl_distance"),
-            trade.get("tp1_price"),
-            trade.get("tp1_distance"),
-            trade.get("atr_at_entry"),
-            trade.get("atr_percentile"),
-        ))
-        self.conn.commit()
+        cursor = self.conn.execute(
+            _INSERT_TRADE_SQL, tuple(map(trade.get, _TRADE_COLUMNS))
+        )
+        self._commit()
         return cursor.lastrowid
 
     def close_trade(self, trade_id: int, exit_data: dict):
-        self.conn.execute("""
-            UPDATE trades SET
-                exit_time = ?, exit_price = ?, tp1_hit = ?, trail_stage = ?,
-                exit_reason = ?, pnl_tp1 = ?, pnl_runner = ?, costs = ?,
-                total_pnl = ?, capital_after = ?, status = 'CLOSED'
-            WHERE id = ?
-        """, (
+        self.conn.execute(_CLOSE_TRADE_SQL, (
             exit_data.get("exit_time"),
             exit_data.get("exit_price"),
             1 if exit_data.get("tp1_hit") else 0,
@@ -113,7 +175,7 @@ class Database:
             exit_data.get("capital_after"),
             trade_id,
         ))
-        self.conn.commit()
+        self._commit()
 
     def get_open_trade(self) -> dict | None:
         row = self.conn.execute(
@@ -123,7 +185,7 @@ class Database:
 
     def get_all_trades(self) -> list[dict]:
         rows = self.conn.execute(
-            "SELECT * FROM trades WHERE status = 'CLOSED' ORDER BY exit_time DESC"
+            "SELECT * FROM trades WHERE status = 'CLOSED' ORDER BY exit_time"
         ).fetchall()
         return [dict(r) for r in rows]
 
@@ -135,11 +197,8 @@ class Database:
     # --- State ---
 
     def set_state(self, key: str, value: str):
-        self.conn.execute(
-            "INSERT OR REPLACE INTO state (key, value, updated_at) VALUES (?, ?, ?)",
-            (key, value, datetime.now().isoformat()),
-        )
-        self.conn.commit()
+        self.conn.execute(_SET_STATE_SQL, (key, value))
+        self._commit()
 
     def get_state(self, key: str, default: str | None = None) -> str | None:
         row = self.conn.execute(
@@ -150,25 +209,15 @@ class Database:
     # --- Signal Log ---
 
     def log_signal(self, signal_data: dict):
-        self.conn.execute("""
-            INSERT INTO signals_log (timestamp, close_price, long_score,
-                long_threshold, atr, atr_percentile, rsi, adx, session,
-                signal_triggered, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            signal_data.get("timestamp"),
-            signal_data.get("close"),
-            signal_data.get("long_score"),
-            signal_data.get("long_threshold"),
-            signal_data.get("atr"),
-            signal_data.get("atr_percentile"),
-            signal_data.get("rsi"),
-            signal_data.get("adx"),
-            signal_data.get("session"),
-            1 if signal_data.get("signal") else 0,
-            signal_data.get("notes", ""),
-        ))
-        self.conn.commit()
+        self.log_signals_many([signal_data])
+
+    def log_signals_many(self, rows: list[dict]):
+        """Insert several signal rows in one statement and one commit."""
+        self.conn.executemany(_LOG_SIGNAL_SQL, [
+            (*map(r.get, _SIGNAL_KEYS), 1 if r.get("signal") else 0, r.get("notes", ""))
+            for r in rows
+        ])
+        self._commit()
 
     def get_recent_signals(self, limit: int = 50) -> list[dict]:
         rows = self.conn.execute(
@@ -177,4 +226,8 @@ class Database:
         return [dict(r) for r in rows]
 
     def close(self):
-        self.conn.close()
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
@@ -1,17 +1,13 @@
 """Indicator engine — imports and runs the nq_scalper pipeline on live data."""
 
-import sys
+import hashlib
 import logging
-from pathlib import Path
+import threading
 
 import numpy as np
 import pandas as pd
 
-# Add nq_scalper to path so we can import its modules
-NQ_SCALPER_DIR = str(Path(__file__).resolve().parent.parent.parent / "nq_scalper")
-if NQ_SCALPER_DIR not in sys.path:
-    sys.path.insert(0, NQ_SCALPER_DIR)
-
+import dashboard_config  # noqa: F401  (puts nq_scalper on sys.path)
 from indicators import compute_15m_indicators
 from mtf import build_mtf
 from patterns import precompute_patterns
@@ -19,12 +15,61 @@ from scoring import precompute_all_scores
 
 logger = logging.getLogger(__name__)
 
+WARMUP_BARS = 300  # leading bars whose indicator values aren't settled yet
+
+_KEY_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# Enriched-frame columns read by _extract_signal_data
+_SIGNAL_COLUMNS = (
+    "long_score", "effective_thresh", "Close", "Open", "High", "Low", "Volume",
+    "long_confirms", "long_thresh", "session_penalty", "rsi", "adx",
+    "macd_line", "macd_signal", "macd_hist", "ema9", "ema21", "ema50",
+    "ema200", "vwap", "atr", "atr_pctile", "atr_adj", "st_line", "st_dir",
+    "st_bullish", "primary_bull", "mtf_bullish", "mtf4h_bullish",
+    "daily_bullish", "ema_slope_bull", "longs_blocked", "vol_above",
+    "vol_spike", "session", "tech_sl_long",
+)
+
+
+def _frame_key(df: pd.DataFrame) -> bytes:
+    """Content identity for a bar window: a digest of its index and OHLCV.
+
+    Hashes every bar, not just the last one, so a revised interior bar
+    (a late volume fix, a merged backfill) also invalidates the memo.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(df.index.asi8.tobytes())
+    h.update(str(df.index.tz).encode())
+    for c in _KEY_COLUMNS:
+        if c in df.columns:
+            h.update(c.encode())
+            h.update(np.ascontiguousarray(df[c].to_numpy()).tobytes())
+    return h.digest()
+
+
+# NaN is the only value not equal to itself; this also catches numpy
+# float32 NaNs, without np.isnan's ufunc dispatch per scalar.
+def _safe_float(val, default=0.0):
+    if val is None or val != val:
+        return default
+    return float(val)
+
+
+def _safe_bool(val, default=False):
+    if val is None or val != val:
+        return default
+    return bool(val)
+
 
 class IndicatorEngine:
     """Runs the full nq_scalper indicator pipeline on live data."""
 
     def __init__(self):
-        self._last_processed = None
+        # Key of the input frame behind last_enriched_df (see _frame_key)
+        self._last_processed: bytes | None = None
+        # Untrimmed: still includes the WARMUP_BARS leading bars
+        self.last_enriched_df: pd.DataFrame | None = None
+        self._lock = threading.Lock()
 
     def process(self, df: pd.DataFrame) -> dict | None:
         """Run full indicator pipeline on current data.
@@ -32,32 +77,22 @@ class IndicatorEngine:
         Returns a dict with the latest bar's signal info,
         or None if data is insufficient.
         """
-        if df.empty or len(df) < 300:
+        if df.empty or len(df) < WARMUP_BARS:
             logger.warning("Insufficient data for indicators: %d bars", len(df))
             return None
 
         try:
-            # Step 1: 15m indicators
-            df = compute_15m_indicators(df)
-
-            # Step 2: Multi-timeframe (resample + merge)
-            df = build_mtf(df)
-
-            # Step 3: Patterns
-            df = precompute_patterns(df)
-
-            # Step 4: Scoring (scores + thresholds + tech SL)
-            df = precompute_all_scores(df)
-
-            # Trim warm-up bars
-            df = df.iloc[300:]
+            df = self._run_pipeline(df)
 
-            if df.empty:
+            # Only the last bar is needed, so skip the warm-up trim and just
+            # check that a post-warm-up bar exists.
+            if len(df) <= WARMUP_BARS:
                 return None
 
-            latest = df.iloc[-1]
-
-            return self._extract_signal_data(latest, df)
+            # Read the last row column by column rather than via df.iloc[-1],
+            # which boxes every one of the ~200 columns into an object Series
+            bar = {c: df[c].iat[-1] for c in _SIGNAL_COLUMNS if c in df.columns}
+            return self._extract_signal_data(df.index[-1], bar)
 
         except Exception as e:
             logger.error("Indicator processing failed: %s", e, exc_info=True)
@@ -65,79 +100,101 @@ class IndicatorEngine:
 
     def process_full(self, df: pd.DataFrame) -> pd.DataFrame | None:
         """Run full pipeline and return enriched DataFrame (for chart data)."""
-        if df.empty or len(df) < 300:
+        if df.empty or len(df) < WARMUP_BARS:
             return None
 
         try:
-            df = compute_15m_indicators(df)
-            df = build_mtf(df)
-            df = precompute_patterns(df)
-            df = precompute_all_scores(df)
-            return df.iloc[300:]
+            return self._run_pipeline(df).iloc[WARMUP_BARS:]
         except Exception as e:
             logger.error("Full processing failed: %s", e, exc_info=True)
             return None
 
-    def _extract_signal_data(self, bar, df: pd.DataFrame) -> dict:
-        """Extract all relevant signal fields from the latest bar."""
+    def get_enriched(self, df: pd.DataFrame) -> pd.DataFrame | None:
+        """Return the enriched frame for *df*, reusing the last run if it is current.
+
+        The scheduler already runs the pipeline on every tick; chart requests
+        only pay for a recompute when the bars have changed since then.
+        """
+        return self.process_full(df)
+
+    def _run_pipeline(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Indicators → MTF → patterns → scoring, warm-up bars included.
+
+        The result is memoised on a digest of the input bars, so ticks that
+        bring no new or changed bar skip the recompute entirely.
+        """
+        key = _frame_key(df)
+        with self._lock:
+            if key == self._last_processed and self.last_enriched_df is not None:
+                return self.last_enriched_df
+
+            # Step 1: 15m indicators
+            df = compute_15m_indicators(df)
+
+            # Step 2: Multi-timeframe (resample + merge)
+            df = build_mtf(df)
+
+            # Step 3: Patterns
+            df = precompute_patterns(df)
+
+            # Step 4: Scoring (scores + thresholds + tech SL)
+            df = precompute_all_scores(df)
 
-        def safe_float(val, default=0.0):
-            if val is None or (isinstance(val, float) and np.isnan(val)):
-                return default
-            return float(val)
+            self.last_enriched_df = df
+            self._last_processed = key
+            return df
 
-        def safe_bool(val, default=False):
-            if val is None or (isinstance(val, float) and np.isnan(val)):
-                return default
-            return bool(val)
+    def _extract_signal_data(self, ts: pd.Timestamp, bar: dict) -> dict:
+        """Extract all relevant signal fields from the latest bar's values."""
 
-        long_score = safe_float(bar.get("long_score"))
-        effective_thresh = safe_float(bar.get("effective_thresh"))
+        long_score = _safe_float(bar.get("long_score"))
+        effective_thresh = _safe_float(bar.get("effective_thresh"))
 
         return {
-            "timestamp": str(bar.name),
-            "close": safe_float(bar.get("Close")),
-            "open": safe_float(bar.get("Open")),
-            "high": safe_float(bar.get("High")),
-            "low": safe_float(bar.get("Low")),
-            "volume": safe_float(bar.get("Volume")),
+            "timestamp": str(ts),
+            "weekday": ts.weekday(),
+            "close": _safe_float(bar.get("Close")),
+            "open": _safe_float(bar.get("Open")),
+            "high": _safe_float(bar.get("High")),
+            "low": _safe_float(bar.get("Low")),
+            "volume": _safe_float(bar.get("Volume")),
             # Score
             "long_score": long_score,
             "long_threshold": effective_thresh,
-            "long_confirms": safe_float(bar.get("long_confirms")),
-            "long_thresh_base": safe_float(bar.get("long_thresh")),
-            "session_penalty": safe_float(bar.get("session_penalty")),
+            "long_confirms": _safe_float(bar.get("long_confirms")),
+            "long_thresh_base": _safe_float(bar.get("long_thresh")),
+            "session_penalty": _safe_float(bar.get("session_penalty")),
             "signal": long_score >= effective_thresh,
             # Indicators
-            "rsi": safe_float(bar.get("rsi")),
-            "adx": safe_float(bar.get("adx")),
-            "macd_line": safe_float(bar.get("macd_line")),
-            "macd_signal": safe_float(bar.get("macd_signal")),
-            "macd_hist": safe_float(bar.get("macd_hist")),
-            "ema9": safe_float(bar.get("ema9")),
-            "ema21": safe_float(bar.get("ema21")),
-            "ema50": safe_float(bar.get("ema50")),
-            "ema200": safe_float(bar.get("ema200")),
-            "vwap": safe_float(bar.get("vwap")),
+            "rsi": _safe_float(bar.get("rsi")),
+            "adx": _safe_float(bar.get("adx")),
+            "macd_line": _safe_float(bar.get("macd_line")),
+            "macd_signal": _safe_float(bar.get("macd_signal")),
+            "macd_hist": _safe_float(bar.get("macd_hist")),
+            "ema9": _safe_float(bar.get("ema9")),
+            "ema21": _safe_float(bar.get("ema21")),
+            "ema50": _safe_float(bar.get("ema50")),
+            "ema200": _safe_float(bar.get("ema200")),
+            "vwap": _safe_float(bar.get("vwap")),
             # ATR
-            "atr": safe_float(bar.get("atr")),
-            "atr_percentile": safe_float(bar.get("atr_pctile")),
-            "atr_adj": safe_float(bar.get("atr_adj")),
+            "atr": _safe_float(bar.get("atr")),
+            "atr_percentile": _safe_float(bar.get("atr_pctile")),
+            "atr_adj": _safe_float(bar.get("atr_adj")),
             # Supertrend
-            "supertrend": safe_float(bar.get("st_line")),
-            "st_direction": safe_float(bar.get("st_dir")),
-            "st_bullish": safe_bool(bar.get("st_bullish")),
+            "supertrend": _safe_float(bar.get("st_line")),
+            "st_direction": _safe_float(bar.get("st_dir")),
+            "st_bullish": _safe_bool(bar.get("st_bullish")),
             # Flags
-            "primary_bull": safe_bool(bar.get("primary_bull")),
-            "mtf_bullish": safe_bool(bar.get("mtf_bullish")),
-            "mtf4h_bullish": safe_bool(bar.get("mtf4h_bullish")),
-            "daily_bullish": safe_bool(bar.get("daily_bullish")),
-            "ema_slope_bull": safe_bool(bar.get("ema_slope_bull")),
-            "longs_blocked": safe_bool(bar.get("longs_blocked")),
-            "vol_above": safe_bool(bar.get("vol_above")),
-            "vol_spike": safe_bool(bar.get("vol_spike")),
+            "primary_bull": _safe_bool(bar.get("primary_bull")),
+            "mtf_bullish": _safe_bool(bar.get("mtf_bullish")),
+            "mtf4h_bullish": _safe_bool(bar.get("mtf4h_bullish")),
+            "daily_bullish": _safe_bool(bar.get("daily_bullish")),
+            "ema_slope_bull": _safe_bool(bar.get("ema_slope_bull")),
+            "longs_blocked": _safe_bool(bar.get("longs_blocked")),
+            "vol_above": _safe_bool(bar.get("vol_above")),
+            "vol_spike": _safe_bool(bar.get("vol_spike")),
             # Session
             "session": str(bar.get("session", "Closed")),
             # Tech SL
-            "tech_sl": safe_float(bar.get("tech_sl_long")),
+            "tech_sl": _safe_float(bar.get("tech_sl_long")),
         }
@@ -6,26 +6,75 @@ Reuses exact same logic as nq_scalper's backtest_engine.py:
 - Matching cost model
 """
 
-import sys
+import math
+import time
 import logging
 from datetime import datetime
-from pathlib import Path
 
 import numpy as np
 
-NQ_SCALPER_DIR = str(Path(__file__).resolve().parent.parent.parent / "nq_scalper")
-if NQ_SCALPER_DIR not in sys.path:
-    sys.path.insert(0, NQ_SCALPER_DIR)
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
 
+import dashboard_config  # noqa: F401  (puts nq_scalper on sys.path)
 from config import (
     POINT_VALUE, NUM_CONTRACTS, MAX_SL_POINTS, RR_RATIO_TP1,
     COMMISSION_PER_CONTRACT, SLIPPAGE_COST, TRAILING_ATR_MULT,
     USE_SUPERTREND_TRAILING, COOLDOWN_BARS, MIN_PRICE_CHANGE,
     WEDNESDAY_LONG_MIN_SCORE, THURSDAY_MIN_SCORE, EUROPE_MIN_SCORE,
 )
+from trailing import trail_update
 
 logger = logging.getLogger(__name__)
 
+TRADE_COLUMN_CAPACITY = 64  # initial rows in the P&L column; grows by doubling
+_SQRT_252 = math.sqrt(252)  # Sharpe annualisation (trading days)
+# Trailing config as the plain float/bool _trailing_update takes
+_TRAIL_ATR_MULT = float(TRAILING_ATR_MULT)
+_USE_ST_TRAIL = bool(USE_SUPERTREND_TRAILING)
+# trailing.trail_update is the one copy of the trail logic, shared with the backtest
+_trailing_update = njit(cache=True)(trail_update)
+
+
+def warm_up_jit() -> None:
+    """Compile (or load from numba's on-disk cache) the njit'd helpers.
+
+    Run once at startup so the first trailing-stop update on a live tick
+    doesn't stall on JIT compilation. A no-op cost without numba.
+    """
+    start = time.perf_counter()
+    _trailing_update(1, 0.0, 0.0, 1.0, 0.0, 1.0, 0.0, False,
+                     _TRAIL_ATR_MULT, _USE_ST_TRAIL)
+    logger.info("JIT warm-up done in %.2fs", time.perf_counter() - start)
+
+
+# Price / score / P&L fields rounded to 2 dp whenever a trade leaves the trader
+_TRADE_ROUNDED_FIELDS = (
+    "entry_price", "exit_price", "entry_score", "sl_price", "sl_distance",
+    "tp1_price", "tp1_distance", "atr_at_entry", "atr_percentile",
+    "pnl_tp1", "pnl_runner", "costs", "total_pnl", "capital_after",
+)
+
+
+def serialize_trade(trade: dict) -> dict:
+    """Copy of *trade* with its price and P&L fields rounded for output."""
+    out = dict(trade)
+    for field in _TRADE_ROUNDED_FIELDS:
+        value = out.get(field)
+        if isinstance(value, float):
+            out[field] = round(value, 2)
+    return out
+
+
+def _exited_on(trade: dict, day: str | None) -> bool:
+    """True if *trade*'s exit_time falls on *day* (YYYY-MM-DD)."""
+    return day is not None and str(trade.get("exit_time", "")).startswith(day)
+
 
 class TrailingStop:
     """3-stage trailing stop for the runner contract (matches trailing.py)."""
@@ -37,28 +86,17 @@ class TrailingStop:
         self.stage = 1
 
     def update(self, bar_close: float, atr: float, st_line: float, st_bullish: bool):
-        current_profit = bar_close - self.entry_price
-
-        # Stage 2: profit >= SL * 1.5
-        if self.stage == 1 and current_profit >= self.sl_distance * 1.5:
-            self.stage = 2
-            new_trail = self.entry_price + self.sl_distance * 0.5
-            self.trail_stop = max(self.trail_stop, new_trail)
-
-        # Stage 3: profit >= SL * 2.0
-        if self.stage == 2 and current_profit >= self.sl_distance * 2.0:
-            self.stage = 3
-
-        # Stage 3: ATR dynamic trailing
-        if self.stage == 3 and not np.isnan(atr):
-            atr_trail = bar_close - atr * TRAILING_ATR_MULT
-            if USE_SUPERTREND_TRAILING and st_bullish and not np.isnan(st_line):
-                st_trail = st_line
-            else:
-                st_trail = atr_trail
-            new_trail = max(atr_trail, st_trail)
-            new_trail = max(new_trail, self.entry_price)
-            self.trail_stop = max(self.trail_stop, new_trail)
+        # Stages 1-2 only move once profit reaches the next stage's threshold
+        if self.stage < 3:
+            next_mult = 1.5 if self.stage == 1 else 2.0
+            if bar_close - self.entry_price < self.sl_distance * next_mult:
+                return
+        self.stage, self.trail_stop = _trailing_update(
+            self.stage, float(self.trail_stop), float(self.entry_price),
+            float(self.sl_distance), float(bar_close), float(atr),
+            float(st_line), bool(st_bullish),
+            _TRAIL_ATR_MULT, _USE_ST_TRAIL,
+        )
 
     def is_stopped(self, bar_low: float) -> bool:
         return bar_low <= self.trail_stop
@@ -79,12 +117,63 @@ class PaperTrader:
         self.initial_capital = initial_capital
         self.capital = initial_capital
         self.position = None  # Current open position dict
-        self.trade_history = []  # Completed trades
+        self.trade_history = []  # Completed trades (see property below)
         self.trade_count = 0
         self._cooldown_bar = -999
         self._cooldown_price = 0.0
         self._bar_counter = 0  # Simulated bar counter for cooldown
 
+        # Config bound once; the per-bar methods read these as attributes
+        self._point_value = POINT_VALUE
+        self._num_contracts = NUM_CONTRACTS
+        self._max_sl_points = MAX_SL_POINTS
+        self._rr_tp1 = RR_RATIO_TP1
+        self._cooldown_bars = COOLDOWN_BARS
+        self._min_price_change = MIN_PRICE_CHANGE
+        half_comm = COMMISSION_PER_CONTRACT / 2
+        # TP1 hit: 6 half-fills comm + 4 slippage fills; no TP1: 4 + 2
+        self._costs_tp1_hit = 6 * half_comm + 4 * SLIPPAGE_COST
+        self._costs_no_tp1 = 4 * half_comm + 2 * SLIPPAGE_COST
+
+        # Minimum long score per session / weekday (Mon=0); closed sessions
+        # never trade, anything unlisted has no extra minimum
+        self._session_min = {
+            "Maintenance": math.inf,
+            "Closed": math.inf,
+            "Europe": EUROPE_MIN_SCORE,
+        }
+        no_min = -math.inf
+        self._dow_min_score = (
+            no_min, no_min, WEDNESDAY_LONG_MIN_SCORE, THURSDAY_MIN_SCORE,
+            no_min, no_min, no_min,
+        )
+
+    @property
+    def trade_history(self) -> list[dict]:
+        """Completed trades as unrounded row dicts (see serialize_trade)."""
+        return self._trades
+
+    @trade_history.setter
+    def trade_history(self, trades: list[dict]):
+        self._trades = list(trades)
+        # total_pnl is also kept as a contiguous column for get_stats
+        self._n_trades = len(self._trades)
+        self._pnl = np.empty(max(TRADE_COLUMN_CAPACITY, self._n_trades), np.float64)
+        self._pnl[:self._n_trades] = [t["total_pnl"] for t in self._trades]
+        # Trades from _today_start on exited on _today_date (set lazily)
+        self._today_date = None
+        self._today_start = self._n_trades
+
+    def _record_trade(self, trade: dict):
+        """Append a closed trade to the row list and the P&L column."""
+        if self._n_trades == len(self._pnl):
+            self._pnl = np.concatenate([self._pnl, np.empty_like(self._pnl)])
+        self._pnl[self._n_trades] = trade["total_pnl"]
+        self._n_trades += 1
+        self._trades.append(trade)
+        if not _exited_on(trade, self._today_date):
+            self._today_start = self._n_trades
+
     def check_entry(self, signal_data: dict) -> bool:
         """Check if we should enter a new position."""
         if self.position is not None:
@@ -101,35 +190,21 @@ class PaperTrader:
 
         score = signal_data.get("long_score", 0)
 
-        # Session filter
-        session = signal_data.get("session", "")
-        if session in ("Maintenance", "Closed"):
+        # Session and day-of-week filters
+        if score < self._session_min.get(signal_data.get("session", ""), -math.inf):
             return False
-        if session == "Europe" and score < EUROPE_MIN_SCORE:
+        dow = signal_data.get("weekday")
+        if dow is not None and score < self._dow_min_score[dow]:
             return False
 
-        # Day-of-week filters
-        try:
-            ts = signal_data.get("timestamp", "")
-            if ts:
-                from datetime import datetime as dt
-                parsed = dt.fromisoformat(str(ts).replace("Z", "+00:00"))
-                dow = parsed.weekday()
-                if dow == 2 and score < WEDNESDAY_LONG_MIN_SCORE:
-                    return False
-                if dow == 3 and score < THURSDAY_MIN_SCORE:
-                    return False
-        except Exception:
-            pass
-
         # Cooldown check
         self._bar_counter += 1
         bars_elapsed = self._bar_counter - self._cooldown_bar
-        if bars_elapsed < COOLDOWN_BARS:
+        if bars_elapsed < self._cooldown_bars:
             close = signal_data.get("close", 0)
             if self._cooldown_price > 0:
                 pct_move = abs(close - self._cooldown_price) / self._cooldown_price * 100
-                if pct_move < MIN_PRICE_CHANGE:
+                if pct_move < self._min_price_change:
                     return False
 
         return True
@@ -145,22 +220,22 @@ class PaperTrader:
             tech_sl = entry_price - sl_distance
 
         # Cap SL at MAX_SL_POINTS (40 pts)
-        if sl_distance > MAX_SL_POINTS:
-            sl_distance = MAX_SL_POINTS
+        if sl_distance > self._max_sl_points:
+            sl_distance = self._max_sl_points
             tech_sl = entry_price - sl_distance
 
-        tp1_price = entry_price + sl_distance * RR_RATIO_TP1
+        tp1_price = entry_price + sl_distance * self._rr_tp1
 
         self.position = {
             "entry_time": signal_data["timestamp"],
             "entry_price": entry_price,
             "entry_score": signal_data.get("long_score", 0),
             "entry_session": signal_data.get("session", "US"),
-            "contracts": NUM_CONTRACTS,
+            "contracts": self._num_contracts,
             "sl_price": tech_sl,
             "sl_distance": sl_distance,
             "tp1_price": tp1_price,
-            "tp1_distance": sl_distance * RR_RATIO_TP1,
+            "tp1_distance": sl_distance * self._rr_tp1,
             "tp1_hit": False,
             "trailing": None,
             "trail_stage": 0,
@@ -217,7 +292,7 @@ class PaperTrader:
             if high >= pos["tp1_price"]:
                 pos["tp1_hit"] = True
                 pos["contracts"] = 1
-                pos["pnl_tp1"] = (pos["tp1_price"] - pos["entry_price"]) * POINT_VALUE
+                pos["pnl_tp1"] = (pos["tp1_price"] - pos["entry_price"]) * self._point_value
                 pos["trailing"] = TrailingStop(pos["entry_price"], pos["sl_distance"])
                 pos["trail_stage"] = 1
                 pos["trail_stop"] = pos["entry_price"]
@@ -240,21 +315,23 @@ class PaperTrader:
         return None
 
     def _exit(self, exit_price: float, exit_reason: str, timestamp: str) -> dict:
-        """Close position and record trade."""
+        """Close position and record trade.
+
+        The history keeps exact values; the returned copy (for the DB and
+        alerts) is rounded by serialize_trade.
+        """
         pos = self.position
 
         if pos["tp1_hit"]:
             pnl_tp1 = pos["pnl_tp1"]
-            pnl_runner = (exit_price - pos["entry_price"]) * POINT_VALUE
-            # TP1 hit cost model: 6 half-fills comm + 4 slippage fills
-            half_comm = COMMISSION_PER_CONTRACT / 2
-            costs = 6 * half_comm + 4 * SLIPPAGE_COST
+            pnl_runner = (exit_price - pos["entry_price"]) * self._point_value
+            costs = self._costs_tp1_hit
         else:
             pnl_tp1 = 0.0
-            pnl_runner = (exit_price - pos["entry_price"]) * POINT_VALUE * NUM_CONTRACTS
-            # No TP1 cost model: 4 half-fills comm + 2 slippage fills
-            half_comm = COMMISSION_PER_CONTRACT / 2
-            costs = 4 * half_comm + 2 * SLIPPAGE_COST
+            pnl_runner = (
+                (exit_price - pos["entry_price"]) * self._point_value * self._num_contracts
+            )
+            costs = self._costs_no_tp1
 
         total_pnl = pnl_tp1 + pnl_runner - costs
         self.capital += total_pnl
@@ -263,26 +340,26 @@ class PaperTrader:
             "trade_num": self.trade_count,
             "entry_time": pos["entry_time"],
             "exit_time": timestamp,
-            "entry_price": round(pos["entry_price"], 2),
-            "exit_price": round(exit_price, 2),
-            "entry_score": round(pos["entry_score"], 2),
+            "entry_price": pos["entry_price"],
+            "exit_price": exit_price,
+            "entry_score": pos["entry_score"],
             "entry_session": pos["entry_session"],
-            "sl_price": round(pos["sl_price"], 2),
-            "sl_distance": round(pos["sl_distance"], 2),
-            "tp1_price": round(pos["tp1_price"], 2),
-            "tp1_distance": round(pos["sl_distance"] * RR_RATIO_TP1, 2),
+            "sl_price": pos["sl_price"],
+            "sl_distance": pos["sl_distance"],
+            "tp1_price": pos["tp1_price"],
+            "tp1_distance": pos["sl_distance"] * self._rr_tp1,
             "tp1_hit": pos["tp1_hit"],
             "trail_stage": pos.get("trail_stage", 0),
             "exit_reason": exit_reason,
-            "atr_at_entry": round(pos.get("atr_at_entry", 0), 2),
-            "atr_percentile": round(pos.get("atr_percentile", 0), 2),
-            "pnl_tp1": round(pnl_tp1, 2),
-            "pnl_runner": round(pnl_runner, 2),
-            "costs": round(costs, 2),
-            "total_pnl": round(total_pnl, 2),
-            "capital_after": round(self.capital, 2),
+            "atr_at_entry": pos.get("atr_at_entry", 0),
+            "atr_percentile": pos.get("atr_percentile", 0),
+            "pnl_tp1": pnl_tp1,
+            "pnl_runner": pnl_runner,
+            "costs": costs,
+            "total_pnl": total_pnl,
+            "capital_after": self.capital,
         }
-        self.trade_history.append(trade)
+        self._record_trade(trade)
         self.position = None
 
         logger.info(
@@ -290,7 +367,7 @@ class PaperTrader:
             exit_reason, exit_price, total_pnl, self.capital,
         )
 
-        return trade
+        return serialize_trade(trade)
 
     def get_position_dict(self) -> dict | None:
         """Get current position as a serializable dict."""
@@ -303,8 +380,8 @@ class PaperTrader:
 
     def get_stats(self) -> dict:
         """Calculate performance stats from trade history."""
-        trades = self.trade_history
-        if not trades:
+        n = self._n_trades
+        if not n:
             return {
                 "total_trades": 0, "win_rate": 0, "pf": 0,
                 "total_pnl": 0, "avg_pnl": 0, "avg_win": 0, "avg_loss": 0,
@@ -312,54 +389,39 @@ class PaperTrader:
                 "capital": self.capital,
             }
 
-        wins = [t for t in trades if t["total_pnl"] > 0]
-        losses = [t for t in trades if t["total_pnl"] <= 0]
-        total_wins = sum(t["total_pnl"] for t in wins)
-        total_losses = abs(sum(t["total_pnl"] for t in losses))
-        total_pnl = sum(t["total_pnl"] for t in trades)
-        pnls = [t["total_pnl"] for t in trades]
-
-        # Max drawdown
-        equity = []
-        running = self.initial_capital
-        peak = running
-        max_dd = 0
-        for t in trades:
-            running += t["total_pnl"]
-            equity.append(running)
-            peak = max(peak, running)
-            dd = peak - running
-            max_dd = max(max_dd, dd)
+        pnls = self._pnl[:n]
+        wins_mask = pnls > 0
+        n_wins = int(wins_mask.sum())
+        n_losses = n - n_wins
+        total_wins = float(pnls[wins_mask].sum())
+        total_losses = float(-pnls[~wins_mask].sum())
+        total_pnl = float(pnls.sum())
+
+        # Max drawdown (peak includes the starting capital)
+        equity = self.initial_capital + np.cumsum(pnls)
+        peak = np.maximum.accumulate(np.maximum(equity, self.initial_capital))
+        max_dd = float((peak - equity).max())
 
         # Sharpe (annualized, assuming ~252 trading days, ~4 trades/week)
-        import statistics
         sharpe = 0.0
         if len(pnls) > 1:
-            mean_pnl = statistics.mean(pnls)
-            std_pnl = statistics.stdev(pnls)
+            std_pnl = pnls.std(ddof=1)
             if std_pnl > 0:
-                sharpe = (mean_pnl / std_pnl) * (252 ** 0.5)
-
-        # Current streak
-        streak = 0
-        for t in reversed(trades):
-            if streak == 0:
-                streak = 1 if t["total_pnl"] > 0 else -1
-            elif streak > 0 and t["total_pnl"] > 0:
-                streak += 1
-            elif streak < 0 and t["total_pnl"] <= 0:
-                streak -= 1
-            else:
-                break
+                sharpe = float(pnls.mean() / std_pnl) * _SQRT_252
+
+        # Current streak: run of same-outcome trades ending at the last one
+        flipped = np.flatnonzero(wins_mask[::-1] != wins_mask[-1])
+        run = int(flipped[0]) if flipped.size else n
+        streak = run if wins_mask[-1] else -run
 
         return {
-            "total_trades": len(trades),
-            "win_rate": len(wins) / len(trades) * 100 if trades else 0,
+            "total_trades": n,
+            "win_rate": n_wins / n * 100,
             "pf": total_wins / total_losses if total_losses > 0 else float("inf"),
             "total_pnl": round(total_pnl, 2),
-            "avg_pnl": round(total_pnl / len(trades), 2) if trades else 0,
-            "avg_win": round(total_wins / len(wins), 2) if wins else 0,
-            "avg_loss": round(-total_losses / len(losses), 2) if losses else 0,
+            "avg_pnl": round(total_pnl / n, 2),
+            "avg_win": round(total_wins / n_wins, 2) if n_wins else 0,
+            "avg_loss": round(-total_losses / n_losses, 2) if n_losses else 0,
             "max_dd": round(max_dd, 2),
             "sharpe": round(sharpe, 2),
             "current_streak": streak,
@@ -367,14 +429,21 @@ class PaperTrader:
         }
 
     def get_today_stats(self) -> dict:
-        """Get stats for today's trades only."""
+        """Get stats for today's trades only.
+
+        Trades are kept oldest first, so today's are a tail of the history;
+        its start is found once per day and then just summed.
+        """
         today = datetime.now().strftime("%Y-%m-%d")
-        today_trades = [
-            t for t in self.trade_history
-            if str(t.get("exit_time", "")).startswith(today)
-        ]
-        today_pnl = sum(t["total_pnl"] for t in today_trades)
+        if today != self._today_date:
+            self._today_date = today
+            start = self._n_trades
+            while start and _exited_on(self._trades[start - 1], today):
+                start -= 1
+            self._today_start = start
+
+        today_pnl = float(self._pnl[self._today_start:self._n_trades].sum())
         return {
             "today_pnl": round(today_pnl, 2),
-            "today_trades": len(today_trades),
+            "today_trades": self._n_trades - self._today_start,
         }
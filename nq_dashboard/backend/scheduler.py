@@ -1,14 +1,38 @@
 """Scheduler — runs the trading loop every 15 minutes."""
 
+import asyncio
 import logging
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 
 logger = logging.getLogger(__name__)
 
+MARKET_TZ = ZoneInfo("US/Eastern")
+TICK_MINUTES = 15
+SUMMARY_HOUR, SUMMARY_MINUTE = 16, 15  # ET, Mon-Fri
+
+
+def _next_tick(after: datetime) -> datetime:
+    """First quarter-hour boundary strictly after *after*."""
+    floor = after.replace(second=0, microsecond=0)
+    return floor + timedelta(minutes=TICK_MINUTES - floor.minute % TICK_MINUTES)
+
+
+def _next_summary(after: datetime) -> datetime:
+    """First weekday 16:15 ET strictly after *after*."""
+    local = after.astimezone(MARKET_TZ)
+    run = local.replace(hour=SUMMARY_HOUR, minute=SUMMARY_MINUTE, second=0, microsecond=0)
+    while run <= local or run.weekday() >= 5:
+        run = (run + timedelta(days=1)).replace(hour=SUMMARY_HOUR, minute=SUMMARY_MINUTE)
+    return run
+
 
 class TradingScheduler:
     def __init__(self, data_feed, engine, paper_trader, alerts, database, broadcast_fn):
-        self.scheduler = AsyncIOScheduler()
+        self._tasks: list[asyncio.Task] = []
+        # One worker: ticks run the pipeline strictly one after another
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nq-tick")
         self.data_feed = data_feed
         self.engine = engine
         self.paper_trader = paper_trader
@@ -16,35 +40,39 @@ class TradingScheduler:
         self.db = database
         self.broadcast = broadcast_fn
         self._open_trade_id = None  # DB trade ID for current open position
+        self._last_bar_ts = None  # Latest bar behind _last_signal
+        self._last_signal = None
 
     def start(self):
-        # Run every 15 minutes, every day (futures trade Sun-Fri + holidays vary)
-        self.scheduler.add_job(
-            self.tick,
-            "cron",
-            minute="0,15,30,45",
-            timezone="US/Eastern",
-            id="main_tick",
-            misfire_grace_time=120,
-        )
-
-        # Daily summary at 16:15 ET
-        self.scheduler.add_job(
-            self.send_daily_summary,
-            "cron",
-            day_of_week="mon-fri",
-            hour=16,
-            minute=15,
-            timezone="US/Eastern",
-            id="daily_summary",
-            misfire_grace_time=300,
-        )
-
-        self.scheduler.start()
+        # Every 15 minutes, every day (futures trade Sun-Fri + holidays vary);
+        # ET offsets are whole hours, so UTC quarter-hours line up with ET's.
+        self._tasks = [
+            asyncio.create_task(self._run_every(_next_tick, self.tick)),
+            asyncio.create_task(self._run_every(_next_summary, self.send_daily_summary)),
+        ]
         logger.info("Scheduler started — ticking every 15 minutes")
 
     def stop(self):
-        self.scheduler.shutdown(wait=False)
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run_every(self, next_run, job):
+        """Await *job* at each time returned by *next_run*, until cancelled.
+
+        The next run is computed from the later of the last scheduled time
+        and now, so an early wake-up can't fire twice and a run that
+        overshoots a slot skips it rather than queueing a catch-up.
+        """
+        run_at = next_run(datetime.now(timezone.utc))
+        while True:
+            await asyncio.sleep(max(run_at.timestamp() - datetime.now(timezone.utc).timestamp(), 0))
+            try:
+                await job()
+            except Exception as e:
+                logger.error("%s failed: %s", job.__name__, e, exc_info=True)
+            run_at = next_run(max(run_at, datetime.now(timezone.utc)))
 
     async def tick(self):
         """Main loop — runs every 15 minutes."""
@@ -58,51 +86,73 @@ class TradingScheduler:
             new_bars = await self.data_feed.update()
             logger.info("Tick: %d new bars fetched", new_bars)
 
-            # 2. Run indicators
+            # 2. Run indicators — unless the feed hasn't moved since last tick
             df = self.data_feed.get_dataframe()
-            signal_data = self.engine.process(df)
-
-            if signal_data is None:
-                logger.warning("No signal data produced")
-                return
-
-            # 3. Log signal
-            self.db.log_signal(signal_data)
-
-            # 4. Update open position (if any)
-            if self.paper_trader.position is not None:
-                exit_event = self.paper_trader.update_position(signal_data)
-                if exit_event:
-                    # Close trade in DB
-                    if self._open_trade_id:
-                        self.db.close_trade(self._open_trade_id, exit_event)
-                        self._open_trade_id = None
-                    # Send alert
-                    await self.alerts.send_exit(exit_event)
-                    # Update DB state
-                    self.db.set_state("capital", str(self.paper_trader.capital))
-
-            # 5. Check for new entry
-            if self.paper_trader.check_entry(signal_data):
-                entry = self.paper_trader.enter_position(signal_data)
-                # Save to DB
-                trade_data = {
-                    "trade_num": self.paper_trader.trade_count,
-                    "entry_time": entry["entry_time"],
-                    "entry_price": entry["entry_price"],
-                    "entry_score": entry["entry_score"],
-                    "entry_session": entry["entry_session"],
-                    "sl_price": entry["sl_price"],
-                    "sl_distance": entry["sl_distance"],
-                    "tp1_price": entry["tp1_price"],
-                    "tp1_distance": entry["tp1_distance"],
-                    "atr_at_entry": entry.get("atr_at_entry", 0),
-                    "atr_percentile": entry.get("atr_percentile", 0),
-                }
-                self._open_trade_id = self.db.insert_trade(trade_data)
-                # Send alert with SL/TP info
-                alert_data = {**signal_data, **entry}
-                await self.alerts.send_signal(alert_data)
+            last_ts = df.index[-1] if not df.empty else None
+            unchanged = (
+                new_bars == 0
+                and self._last_signal is not None
+                and last_ts == self._last_bar_ts
+                and df["Close"].iat[-1] == self._last_signal["close"]
+            )
+            if unchanged:
+                if self.paper_trader.position is None:
+                    logger.info("No new bars since %s — skipping tick", last_ts)
+                    return
+                # SL/TP can still fire on the open position; reuse the signal.
+                signal_data = self._last_signal
+            else:
+                # ~0.25 s of pandas work; keep WebSocket pushes flowing meanwhile.
+                signal_data = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self.engine.process, df
+                )
+
+                if signal_data is None:
+                    logger.warning("No signal data produced")
+                    return
+
+                self._last_bar_ts = last_ts
+                self._last_signal = signal_data
+
+            # 3-5 write in one transaction (one commit); alerts go out after.
+            exit_event = entry = None
+            with self.db.batch():
+                # 3. Log signal (once per distinct signal)
+                if not unchanged:
+                    self.db.log_signal(signal_data)
+
+                # 4. Update open position (if any)
+                if self.paper_trader.position is not None:
+                    exit_event = self.paper_trader.update_position(signal_data)
+                    if exit_event:
+                        if self._open_trade_id:
+                            self.db.close_trade(self._open_trade_id, exit_event)
+                            self._open_trade_id = None
+                        self.db.set_state("capital", str(self.paper_trader.capital))
+
+                # 5. Check for new entry
+                if self.paper_trader.check_entry(signal_data):
+                    entry = self.paper_trader.enter_position(signal_data)
+                    trade_data = {
+                        "trade_num": self.paper_trader.trade_count,
+                        "entry_time": entry["entry_time"],
+                        "entry_price": entry["entry_price"],
+                        "entry_score": entry["entry_score"],
+                        "entry_session": entry["entry_session"],
+                        "sl_price": entry["sl_price"],
+                        "sl_distance": entry["sl_distance"],
+                        "tp1_price": entry["tp1_price"],
+                        "tp1_distance": entry["tp1_distance"],
+                        "atr_at_entry": entry.get("atr_at_entry", 0),
+                        "atr_percentile": entry.get("atr_percentile", 0),
+                    }
+                    self._open_trade_id = self.db.insert_trade(trade_data)
+
+            if exit_event:
+                await self.alerts.send_exit(exit_event)
+            if entry:
+                # Alert with SL/TP info
+                await self.alerts.send_signal({**signal_data, **entry})
 
             # 6. Broadcast to WebSocket clients
             await self.broadcast()
@@ -3,6 +3,43 @@ import { createChart } from 'lightweight-charts';
 
 const TIMEFRAMES = ['5m', '15m', '1H'];
 
+const PRICE_FIELDS = ['open', 'high', 'low', 'close', 'ema50', 'ema200', 'supertrend', 'vwap'];
+
+// /api/candles sends prices as integer tick counts plus a tick_scale.
+function decodeCandles(body) {
+  if (Array.isArray(body)) return body;
+  const scale = body?.tick_scale ?? 1;
+  return (body?.candles ?? []).map(c => {
+    const out = { ...c };
+    for (const f of PRICE_FIELDS) {
+      if (out[f] != null) out[f] *= scale;
+    }
+    return out;
+  });
+}
+
+// ?format=ndjson: a {tick_scale} header line, then one candle per line.
+// Lines are parsed as chunks arrive instead of after the whole body.
+async function readNdjsonCandles(response) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  const rows = [];
+  let buffer = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+    for (const line of lines) {
+      if (line) rows.push(JSON.parse(line));
+    }
+  }
+  if (buffer) rows.push(JSON.parse(buffer));
+  const [header, ...candles] = rows;
+  return { tick_scale: header?.tick_scale, candles };
+}
+
 export default function CandlestickChart({ position, livePrice }) {
   const chartRef = useRef(null);
   const chartInstance = useRef(null);
@@ -18,10 +55,11 @@ export default function CandlestickChart({ position, livePrice }) {
 
   const loadCandles = useCallback((chart, candleSeries, ema50, ema200, st, tf) => {
     const interval = tf.toLowerCase();
-    fetch(`/api/candles?interval=${interval}&limit=400`)
-      .then(r => r.json())
-      .then(candles => {
-        if (!Array.isArray(candles) || candles.length === 0) return;
+    fetch(`/api/candles?interval=${interval}&limit=400&format=ndjson`)
+      .then(readNdjsonCandles)
+      .then(body => {
+        const candles = decodeCandles(body);
+        if (candles.length === 0) return;
 
         candleSeries.setData(candles.map(c => ({
           time: c.time,
@@ -27,7 +27,12 @@ export function useWebSocket() {
     ws.onmessage = (event) => {
       try {
         const data = JSON.parse(event.data);
-        setState(data);
+        // Server sends a full state_update first, then only changed keys.
+        if (data.type === 'state_diff') {
+          setState(prev => ({ ...prev, ...data, type: 'state_update' }));
+        } else if (data.type !== 'heartbeat') {
+          setState(data);
+        }
       } catch (e) {
         console.error('WS parse error:', e);
       }
@@ -5,356 +5,477 @@ LONG ONLY. Walks through each 15m bar:
 2. Manage open position (SL, TP1, trailing stop)
 3. Check for new signals
 
-All position management, cost model, and signal logic are delegated
-to their respective modules.
+The bar loop runs in a Numba-compiled kernel over plain NumPy arrays
+(pure Python when numba is not installed).  It mirrors signals.py,
+risk_manager.py and trailing.py exactly; every parameter it uses comes
+from an immutable BacktestConfig passed to the engine.
 """
 
 import logging
-from typing import Optional
+from typing import NamedTuple
 
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
 from config import (
     POINT_VALUE, NUM_CONTRACTS, INITIAL_CAPITAL,
-    EOD_CLOSE_HOUR, EOD_CLOSE_MINUTE, USE_EOD_CLOSE, TIMEZONE,
+    EOD_CLOSE_HOUR, EOD_CLOSE_MINUTE, USE_EOD_CLOSE,
+    MAX_SL_POINTS, RR_RATIO_TP1, TP1_FIXED_PTS, TP1_MODE, MIN_RR,
+    COOLDOWN_BARS, MIN_PRICE_CHANGE,
+    WEDNESDAY_LONG_MIN_SCORE, THURSDAY_MIN_SCORE, EUROPE_MIN_SCORE,
+    TRAILING_ATR_MULT, USE_SUPERTREND_TRAILING,
 )
-from signals import CooldownTracker, check_long_signal
-from risk_manager import calc_entry, calc_costs
-from trailing import TrailingStop
+from indicators import SESSION_EUROPE, get_et_components, get_session_codes
+from risk_manager import calc_costs
+from trailing import trail_update
 
 logger = logging.getLogger(__name__)
 
 
 # ═══════════════════════════════════════════════════════════════════
-# TIME UTILITIES
+# RUN CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════
 
-def get_et_time(ts) -> tuple[int, int, int]:
-    """Convert a timestamp to ET (hour, minute, day_of_week)."""
-    if ts.tzinfo is None:
-        ts = ts.tz_localize("UTC")
-    et = ts.tz_convert(TIMEZONE)
-    return et.hour, et.minute, et.dayofweek
+class BacktestConfig(NamedTuple):
+    """Immutable parameters for one backtest run; defaults are config.py's.
+
+    Variants (e.g. generate_reports' B1/B2) are built with
+    BacktestConfig(rr_ratio_tp1=2.0, ...) instead of patching modules.
+    """
+
+    point_value: float = POINT_VALUE
+    num_contracts: int = NUM_CONTRACTS
+    costs_no_tp1: float = calc_costs(tp1_hit=False)
+    costs_tp1: float = calc_costs(tp1_hit=True)
+    max_sl_points: float = MAX_SL_POINTS
+    tp1_mode: str = TP1_MODE
+    tp1_fixed_pts: float = TP1_FIXED_PTS
+    rr_ratio_tp1: float = RR_RATIO_TP1
+    min_rr: float = MIN_RR
+    cooldown_bars: int = COOLDOWN_BARS
+    min_price_change: float = MIN_PRICE_CHANGE
+    wednesday_long_min_score: float = WEDNESDAY_LONG_MIN_SCORE
+    thursday_min_score: float = THURSDAY_MIN_SCORE
+    europe_min_score: float = EUROPE_MIN_SCORE
+    trailing_atr_mult: float = TRAILING_ATR_MULT
+    use_supertrend_trailing: bool = USE_SUPERTREND_TRAILING
+    use_eod_close: bool = USE_EOD_CLOSE
+    eod_close_hour: int = EOD_CLOSE_HOUR
+    eod_close_minute: int = EOD_CLOSE_MINUTE
+
+
+# ═══════════════════════════════════════════════════════════════════
+# KERNEL ENCODINGS
+# ═══════════════════════════════════════════════════════════════════
+
+# Exit reason codes (TRAIL_S<stage> is the stage itself); the kernel
+# records the code and the trade dicts get the label
+_EXIT_REASONS = ("FULL_STOP", "TRAIL_S1", "TRAIL_S2", "TRAIL_S3", "EOD_CLOSE")
+_EXIT_FULL_STOP = 0
+_EXIT_EOD = 4
+
+# Rows of the packed trade arrays (one row per field, one column per trade)
+_F_ENTRY_PRICE, _F_STOP_LOSS, _F_SL_DISTANCE, _F_TP1_PRICE, _F_EXIT_PRICE, \
+    _F_PNL_TP1, _F_PNL_RUNNER, _F_COSTS, _F_CAPITAL = range(9)
+_I_ENTRY_BAR, _I_EXIT_BAR, _I_TP1_HIT, _I_STAGE, _I_REASON = range(5)
 
 
-def is_eod(hour: int, minute: int) -> bool:
-    """Check if we're at EOD close time (16:45 EST)."""
-    return hour == EOD_CLOSE_HOUR and minute >= EOD_CLOSE_MINUTE
+def _float_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Column as a C-contiguous float64 array (bool/object columns too)."""
+    return np.ascontiguousarray(df[col].to_numpy(), dtype=np.float64)
 
 
-def is_maintenance(hour: int) -> bool:
-    """Check if we're in CME maintenance window."""
-    return hour == 17
+def _price_columns(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """High/low/close as float32 when that is exact for all three (tick-sized
+    prices), else float64."""
+    prices = [_float_column(df, col) for col in ("High", "Low", "Close")]
+    narrow = [p.astype(np.float32) for p in prices]
+    if all(np.array_equal(n, p, equal_nan=True) for n, p in zip(narrow, prices)):
+        return tuple(narrow)
+    return tuple(prices)
+
+
+def _bool_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Column as a C-contiguous np.bool_ array; object values use truthiness."""
+    return np.ascontiguousarray(df[col].to_numpy(), dtype=np.bool_)
 
 
 # ═══════════════════════════════════════════════════════════════════
-# POSITION STATE
+# COMPILED KERNEL
 # ═══════════════════════════════════════════════════════════════════
 
-class Position:
-    """Tracks the state of an open LONG position (2-contract split)."""
+@njit(cache=True)
+def _entry_levels(close, tech_sl, max_sl_points, tp1_fixed, tp1_fixed_pts,
+                  rr_ratio_tp1, min_rr):
+    """Scalar calc_entry; returns (ok, stop_loss, sl_distance, tp1_price)."""
+    sl_distance = close - tech_sl
+    if sl_distance <= 0:
+        return False, 0.0, 0.0, 0.0
+
+    if sl_distance > max_sl_points:
+        sl_distance = max_sl_points
+        tech_sl = close - sl_distance
+
+    if tp1_fixed:
+        tp1_price = close + tp1_fixed_pts
+        max_sl_dist = tp1_fixed_pts / min_rr
+        if sl_distance > max_sl_dist:
+            sl_distance = max_sl_dist
+            tech_sl = close - sl_distance
+    else:
+        tp1_price = close + sl_distance * rr_ratio_tp1
+
+    return True, tech_sl, sl_distance, tp1_price
+
+
+# trailing.trail_update is the single copy of the trail logic
+_trailing_update = njit(cache=True)(trail_update)
+
+
+# Explicit signatures: numba compiles the kernel eagerly at import (or loads
+# it from the on-disk cache) instead of on the first run() call.  High/low/
+# close come as float32 when that is lossless (see _price_columns), halving
+# their share of the per-bar loads; float64 prices still work.
+_KERNEL_SIGNATURE = (
+    "Tuple((float64[::1], float64[:, ::1], int64[:, ::1], int64, boolean))("
+    "{price}[::1], {price}[::1], {price}[::1], float64[::1], float64[::1], "
+    "boolean[::1], boolean[::1], float64[::1], float64[::1], boolean[::1], "
+    "boolean[::1], float64[::1], int64[::1], "
+    "int8[::1], int16[::1], int16[::1], int8[::1], "
+    "float64, float64, int64, float64, float64, "
+    "float64, boolean, float64, float64, float64, "
+    "int64, float64, float64, float64, "
+    "float64, float64, boolean, "
+    "boolean, int64, int64)"
+)
 
-    def __init__(
-        self,
-        entry_price: float,
-        stop_loss: float,
-        sl_distance: float,
-        tp1_price: float,
-        entry_bar: int,
-        entry_time,
-        entry_score: float,
-        entry_session: str,
-    ):
-        self.entry_price = entry_price
-        self.stop_loss = stop_loss
-        self.sl_distance = sl_distance
-        self.tp1_price = tp1_price
-        self.entry_bar = entry_bar
-        self.entry_time = entry_time
-        self.entry_score = entry_score
-        self.entry_session = entry_session
 
-        self.tp1_hit: bool = False
-        self.contracts: int = NUM_CONTRACTS  # 2 initially
-        self.trailing: Optional[TrailingStop] = None
+@njit(
+    [_KERNEL_SIGNATURE.format(price=p) for p in ("float32", "float64")],
+    cache=True,
+)
+def _run_backtest_njit(
+    h, l, c, long_score, effective_thresh, longs_blocked, ema_slope_bull,
+    atr, st_line, st_bullish, shift_override, tech_sl_long, active_bars,
+    session_codes, et_hour, et_minute, et_dow,
+    initial_capital, point_value, num_contracts, costs_no_tp1, costs_tp1,
+    max_sl_points, tp1_fixed, tp1_fixed_pts, rr_ratio_tp1, min_rr,
+    cooldown_bars, min_price_change, wed_min_score, thu_min_score,
+    europe_min_score, trailing_atr_mult, use_st_trail,
+    use_eod_close, eod_hour, eod_minute,
+):
+    """Walk the bars; returns (equity, trade_f, trade_i, n_trades, in_pos).
+
+    Only the bar indices in active_bars are visited; capital cannot change
+    on the others, so their equity is back-filled.  trade_f / trade_i hold
+    one row per _F_* / _I_* field; the first n_trades columns are closed
+    trades.  in_pos flags a position still open after the last bar.
+    """
+    n = len(c)
+    equity = np.empty(n, dtype=np.float64)
+    max_trades = n // 2 + 1  # entry and exit never share a bar
+    trade_f = np.empty((9, max_trades), dtype=np.float64)
+    trade_i = np.empty((5, max_trades), dtype=np.int64)
+    n_trades = 0
+    capital = initial_capital
+
+    # Cooldown state
+    last_trade_bar = -999
+    last_trade_price = 0.0
+
+    # Open position state
+    in_pos = False
+    entry_bar = 0
+    entry_price = 0.0
+    stop_loss = 0.0
+    sl_distance = 0.0
+    tp1_price = 0.0
+    tp1_hit = False
+    stage = 0
+    trail_stop = 0.0
+
+    filled = 0
+    for j in range(len(active_bars)):
+        i = active_bars[j]
+        if i > filled:
+            equity[filled:i] = capital
+        filled = i + 1
+
+        bar_close = float(c[i])  # float64 from here on, whatever c's dtype
+        exit_price = 0.0
+        reason = -1
+
+        # EOD close (disabled in validated system)
+        if (use_eod_close and in_pos and et_hour[i] == eod_hour
+                and et_minute[i] >= eod_minute):
+            exit_price = bar_close
+            reason = _EXIT_EOD
+
+        # Skip maintenance / Saturday (only EOD bars get here)
+        elif et_hour[i] == 17 or et_dow[i] == 5:
+            pass
+
+        elif in_pos:
+            if not tp1_hit:
+                # Pre-TP1: full 2-contract position
+                if l[i] <= stop_loss:
+                    exit_price = stop_loss
+                    reason = _EXIT_FULL_STOP
+                elif h[i] >= tp1_price:
+                    tp1_hit = True
+                    stage = 1
+                    trail_stop = entry_price  # breakeven
+            else:
+                # Post-TP1: runner with trailing stop
+                stage, trail_stop = _trailing_update(
+                    stage, trail_stop, entry_price, sl_distance, bar_close,
+                    atr[i], st_line[i], st_bullish[i],
+                    trailing_atr_mult, use_st_trail,
+                )
+                if l[i] <= trail_stop:
+                    exit_price = trail_stop
+                    reason = stage
+
+        elif session_codes[i] >= SESSION_EUROPE:
+            # check_long_signal
+            score = long_score[i]
+            signal = not (
+                np.isnan(effective_thresh[i])
+                or longs_blocked[i]
+                or not ema_slope_bull[i]
+                or score < effective_thresh[i]
+                or (et_dow[i] == 2 and score < wed_min_score)
+                or (et_dow[i] == 3 and score < thu_min_score)
+                or (session_codes[i] == SESSION_EUROPE
+                    and score < europe_min_score)
+            )
+            if signal:
+                # CooldownTracker.is_ready
+                ready = shift_override[i] or i - last_trade_bar >= cooldown_bars
+                if not ready and last_trade_price > 0:
+                    pct_move = abs(bar_close - last_trade_price) / last_trade_price * 100
+                    ready = pct_move >= min_price_change
+                if ready:
+                    ok, sl, dist, tp1 = _entry_levels(
+                        bar_close, tech_sl_long[i], max_sl_points, tp1_fixed,
+                        tp1_fixed_pts, rr_ratio_tp1, min_rr,
+                    )
+                    if ok:
+                        in_pos = True
+                        entry_bar = i
+                        entry_price = bar_close
+                        stop_loss = sl
+                        sl_distance = dist
+                        tp1_price = tp1
+                        tp1_hit = False
+                        stage = 0
+                        last_trade_bar = i
+                        last_trade_price = bar_close
+
+        if reason >= 0:
+            if tp1_hit:
+                pnl_tp1 = (tp1_price - entry_price) * point_value * 1
+                pnl_runner = (exit_price - entry_price) * point_value * 1
+                costs = costs_tp1
+            else:
+                pnl_tp1 = 0.0
+                pnl_runner = (exit_price - entry_price) * point_value * num_contracts
+                costs = costs_no_tp1
+            capital += pnl_tp1 + pnl_runner - costs
+
+            k = n_trades
+            trade_f[_F_ENTRY_PRICE, k] = entry_price
+            trade_f[_F_STOP_LOSS, k] = stop_loss
+            trade_f[_F_SL_DISTANCE, k] = sl_distance
+            trade_f[_F_TP1_PRICE, k] = tp1_price
+            trade_f[_F_EXIT_PRICE, k] = exit_price
+            trade_f[_F_PNL_TP1, k] = pnl_tp1
+            trade_f[_F_PNL_RUNNER, k] = pnl_runner
+            trade_f[_F_COSTS, k] = costs
+            trade_f[_F_CAPITAL, k] = capital
+            trade_i[_I_ENTRY_BAR, k] = entry_bar
+            trade_i[_I_EXIT_BAR, k] = i
+            trade_i[_I_TP1_HIT, k] = tp1_hit
+            trade_i[_I_STAGE, k] = stage
+            trade_i[_I_REASON, k] = reason
+            n_trades += 1
+            in_pos = False
+
+        equity[i] = capital
+
+    equity[filled:] = capital
+    return equity, trade_f, trade_i, n_trades, in_pos
 
 
 # ═══════════════════════════════════════════════════════════════════
 # BACKTEST ENGINE
 # ═══════════════════════════════════════════════════════════════════
 
+def extract_arrays(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Typed NumPy inputs for the backtest kernel, taken from *df* once.
+
+    "tech_sl_long" is the one config-dependent input: it is taken from *df*
+    when present, else the caller supplies it, and either way it must match
+    config.max_sl_points.  Everything else is independent of BacktestConfig,
+    so one dict can be shared by several BacktestEngine runs over the same
+    frame.
+    """
+    et_hour, et_minute, et_dow = get_et_components(df)
+    high, low, close = _price_columns(df)
+    long_score = _float_column(df, "long_score")
+    is_bullish_shift = _float_column(df, "is_bullish_shift_candle")
+    arrays = {
+        "high": high,
+        "low": low,
+        "close": close,
+        "long_score": long_score,
+        "effective_thresh": _float_column(df, "effective_thresh"),
+        "longs_blocked": _bool_column(df, "longs_blocked"),
+        "ema_slope_bull": _bool_column(df, "ema_slope_bull"),
+        "atr": _float_column(df, "atr"),
+        "st_line": _float_column(df, "st_line"),
+        "st_bullish": _bool_column(df, "st_bullish"),
+        # NaN checks done once for all bars instead of per bar in the loop
+        "valid": ~(np.isnan(close) | np.isnan(long_score)),
+        "shift_override": ~np.isnan(is_bullish_shift) & (
+            (is_bullish_shift != 0) | _bool_column(df, "st_buy_signal")
+        ),
+        "session": df["session"].to_numpy(),
+        "session_codes": get_session_codes(df["session"]),
+        "et_hour": et_hour,
+        "et_minute": et_minute,
+        "et_dow": et_dow,
+    }
+    if "tech_sl_long" in df:
+        arrays["tech_sl_long"] = _float_column(df, "tech_sl_long")
+    return arrays
+
+
 class BacktestEngine:
-    """Full backtest engine for the NQ Swing Scalper (LONG ONLY)."""
+    """Full backtest engine for the NQ Swing Scalper (LONG ONLY).
+
+    *arrays* is an optional extract_arrays(df) result to reuse; *config*
+    defaults to BacktestConfig().
+    """
 
-    def __init__(self, df: pd.DataFrame):
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        arrays: dict[str, np.ndarray] | None = None,
+        config: BacktestConfig | None = None,
+    ):
         self.df = df
-        self.position: Optional[Position] = None
-        self.cooldown = CooldownTracker()
+        self.arrays = arrays
+        self.config = config if config is not None else BacktestConfig()
         self.trades: list[dict] = []
+        self.trade_frame: pd.DataFrame = pd.DataFrame()
         self.trade_count: int = 0
         self.capital: float = INITIAL_CAPITAL
-        self.equity_curve: list[float] = []
+        self.equity_curve: np.ndarray = np.empty(0, dtype=np.float64)
 
     def run(self) -> list[dict]:
         """Execute the full backtest. Returns list of trade dicts."""
         n = len(self.df)
         logger.info("Running backtest on %s bars...", f"{n:,}")
 
-        # Pre-extract numpy arrays for speed
-        h = self.df["High"].values
-        l = self.df["Low"].values
-        c = self.df["Close"].values
-        idx = self.df.index
-
-        long_score = self.df["long_score"].values
-        effective_thresh = self.df["effective_thresh"].values
-        longs_blocked = self.df["longs_blocked"].values
-        ema_slope_bull = self.df["ema_slope_bull"].values
-        atr = self.df["atr"].values
-        st_line = self.df["st_line"].values
-        st_bullish = self.df["st_bullish"].values
-        st_buy_signal = self.df["st_buy_signal"].values
-        is_bullish_shift = self.df["is_bullish_shift_candle"].values
-        tech_sl_long = self.df["tech_sl_long"].values
-        sessions = self.df["session"].values
-
-        progress_step = max(1, n // 20)
-
-        for i in range(n):
-            if i % progress_step == 0:
-                pct = int(100 * i / n)
-                logger.info("Progress: %d%% (%s/%s bars)", pct, f"{i:,}", f"{n:,}")
-
-            # Skip NaN bars
-            if np.isnan(c[i]) or np.isnan(long_score[i]):
-                self.equity_curve.append(self.capital)
-                continue
-
-            # Time checks
-            ts = idx[i]
-            et_hour, et_minute, et_dow = get_et_time(ts)
-            session = sessions[i]
-
-            # EOD close (disabled in validated system)
-            if USE_EOD_CLOSE and is_eod(et_hour, et_minute) and self.position is not None:
-                self._close_position(i, c[i], "EOD_CLOSE", idx)
-                self.equity_curve.append(self.capital)
-                continue
-
-            # Skip maintenance / Saturday
-            if is_maintenance(et_hour) or et_dow == 5:
-                self.equity_curve.append(self.capital)
-                continue
-
-            # Position management
-            if self.position is not None:
-                self._manage_position(i, h, l, c, idx, atr, st_line, st_bullish)
-            else:
-                # Check for new entry
-                can_trade = session not in ("Maintenance", "Closed")
-                if can_trade:
-                    shift_override = bool(
-                        is_bullish_shift[i] or st_buy_signal[i]
-                    ) if not np.isnan(is_bullish_shift[i]) else False
-
-                    if check_long_signal(
-                        bar_idx=i,
-                        long_score=long_score[i],
-                        effective_thresh=effective_thresh[i],
-                        longs_blocked=bool(longs_blocked[i]),
-                        ema_slope_bull=bool(ema_slope_bull[i]),
-                        et_dow=et_dow,
-                        cooldown=self.cooldown,
-                        close=c[i],
-                        is_shift_override=shift_override,
-                        session=session,
-                    ):
-                        entry = calc_entry(c[i], tech_sl_long[i])
-                        if entry is not None:
-                            self._enter_long(
-                                i, entry, long_score[i], idx, session,
-                            )
-
-            self.equity_curve.append(self.capital)
+        cfg = self.config
+        a = self.arrays if self.arrays is not None else extract_arrays(self.df)
+        et_hour, et_minute, et_dow = a["et_hour"], a["et_minute"], a["et_dow"]
 
-        logger.info(
-            "Backtest complete. %d trades executed.", self.trade_count,
+        # Bars the loop has to visit: no NaNs, and not maintenance or
+        # Saturday unless they may need an EOD close
+        in_hours = (et_hour != 17) & (et_dow != 5)
+        if cfg.use_eod_close:
+            in_hours |= (
+                (et_hour == cfg.eod_close_hour) & (et_minute >= cfg.eod_close_minute)
+            )
+        active_bars = np.flatnonzero(a["valid"] & in_hours)
+
+        equity, trade_f, trade_i, n_trades, in_pos = _run_backtest_njit(
+            a["high"], a["low"], a["close"], a["long_score"],
+            a["effective_thresh"], a["longs_blocked"], a["ema_slope_bull"],
+            a["atr"], a["st_line"], a["st_bullish"], a["shift_override"],
+            a["tech_sl_long"], active_bars,
+            a["session_codes"], et_hour, et_minute, et_dow,
+            float(self.capital), float(cfg.point_value), int(cfg.num_contracts),
+            float(cfg.costs_no_tp1), float(cfg.costs_tp1),
+            float(cfg.max_sl_points), cfg.tp1_mode == "fixed",
+            float(cfg.tp1_fixed_pts), float(cfg.rr_ratio_tp1), float(cfg.min_rr),
+            int(cfg.cooldown_bars), float(cfg.min_price_change),
+            float(cfg.wednesday_long_min_score), float(cfg.thursday_min_score),
+            float(cfg.europe_min_score), float(cfg.trailing_atr_mult),
+            bool(cfg.use_supertrend_trailing), bool(cfg.use_eod_close),
+            int(cfg.eod_close_hour), int(cfg.eod_close_minute),
         )
-        return self.trades
-
-    # ───────────────────────────────────────────────────────────────
-    # ENTRY
-    # ───────────────────────────────────────────────────────────────
 
-    def _enter_long(
-        self,
-        i: int,
-        entry: dict,
-        score: float,
-        idx,
-        session: str,
-    ) -> None:
-        """Open a new LONG position with 2 contracts."""
-        self.position = Position(
-            entry_price=entry["entry_price"],
-            stop_loss=entry["stop_loss"],
-            sl_distance=entry["sl_distance"],
-            tp1_price=entry["tp1_price"],
-            entry_bar=i,
-            entry_time=idx[i],
-            entry_score=score,
-            entry_session=session,
+        self.equity_curve = equity
+        self.trade_count = n_trades + int(in_pos)
+        if n_trades:
+            self.capital = float(trade_f[_F_CAPITAL, n_trades - 1])
+        columns = self._trade_columns(
+            trade_f[:, :n_trades], trade_i[:, :n_trades],
+            a["long_score"], a["session"],
         )
-        self.cooldown.update(i, entry["entry_price"])
-        self.trade_count += 1
-
-    # ───────────────────────────────────────────────────────────────
-    # POSITION MANAGEMENT
-    # ───────────────────────────────────────────────────────────────
+        self.trade_frame = pd.DataFrame(columns)
+        keys = list(columns)
+        values = [c.tolist() if hasattr(c, "tolist") else c for c in columns.values()]
+        self.trades = [dict(zip(keys, row)) for row in zip(*values)]
 
-    def _manage_position(
-        self, i: int, h, l, c, idx, atr, st_line, st_bullish,
-    ) -> None:
-        """Manage an open LONG position (pre-TP1 or runner)."""
-        pos = self.position
-        bar_low = l[i]
-        bar_high = h[i]
-        bar_close = c[i]
-
-        if not pos.tp1_hit:
-            # ── Pre-TP1: full 2-contract position ──
-
-            # Check SL
-            if bar_low <= pos.stop_loss:
-                exit_price = pos.stop_loss
-                pnl = (exit_price - pos.entry_price) * POINT_VALUE * NUM_CONTRACTS
-                costs = calc_costs(tp1_hit=False)
-                self._log_trade(
-                    exit_price=exit_price,
-                    exit_time=idx[i],
-                    exit_reason="FULL_STOP",
-                    pnl_tp1=0.0,
-                    pnl_runner=pnl,
-                    costs=costs,
-                    tp1_hit=False,
-                    trail_stage=0,
-                )
-                self.position = None
-                return
-
-            # Check TP1
-            if bar_high >= pos.tp1_price:
-                pos.tp1_hit = True
-                pos.contracts = 1  # runner
-                pos.trailing = TrailingStop(pos.entry_price, pos.sl_distance)
-
-        else:
-            # ── Post-TP1: runner (1 contract) with trailing stop ──
-            trail = pos.trailing
-
-            # Update trailing stop
-            trail.update(
-                bar_close=bar_close,
-                atr=atr[i],
-                st_line=st_line[i],
-                st_bullish=bool(st_bullish[i]),
-            )
-
-            # Check trailing stop hit
-            if trail.is_stopped(bar_low):
-                exit_price = trail.trail_stop
-                pnl_tp1 = (pos.tp1_price - pos.entry_price) * POINT_VALUE * 1
-                pnl_runner = (exit_price - pos.entry_price) * POINT_VALUE * 1
-                costs = calc_costs(tp1_hit=True)
-                self._log_trade(
-                    exit_price=exit_price,
-                    exit_time=idx[i],
-                    exit_reason=f"TRAIL_S{trail.stage}",
-                    pnl_tp1=pnl_tp1,
-                    pnl_runner=pnl_runner,
-                    costs=costs,
-                    tp1_hit=True,
-                    trail_stage=trail.stage,
-                )
-                self.position = None
-
-    # ───────────────────────────────────────────────────────────────
-    # FORCE CLOSE
-    # ───────────────────────────────────────────────────────────────
-
-    def _close_position(
-        self, i: int, price: float, reason: str, idx,
-    ) -> None:
-        """Force close at given price (EOD, etc.)."""
-        pos = self.position
-        if pos.tp1_hit:
-            pnl_tp1 = (pos.tp1_price - pos.entry_price) * POINT_VALUE * 1
-            pnl_runner = (price - pos.entry_price) * POINT_VALUE * 1
-            costs = calc_costs(tp1_hit=True)
-            trail_stage = pos.trailing.stage if pos.trailing else 0
-        else:
-            pnl_tp1 = 0.0
-            pnl_runner = (price - pos.entry_price) * POINT_VALUE * NUM_CONTRACTS
-            costs = calc_costs(tp1_hit=False)
-            trail_stage = 0
-
-        self._log_trade(
-            exit_price=price,
-            exit_time=idx[i],
-            exit_reason=reason,
-            pnl_tp1=pnl_tp1,
-            pnl_runner=pnl_runner,
-            costs=costs,
-            tp1_hit=pos.tp1_hit,
-            trail_stage=trail_stage,
+        logger.info(
+            "Backtest complete. %d trades executed.", self.trade_count,
         )
-        self.position = None
+        return self.trades
 
     # ───────────────────────────────────────────────────────────────
     # TRADE LOGGING
     # ───────────────────────────────────────────────────────────────
 
-    def _log_trade(
-        self,
-        exit_price: float,
-        exit_time,
-        exit_reason: str,
-        pnl_tp1: float,
-        pnl_runner: float,
-        costs: float,
-        tp1_hit: bool,
-        trail_stage: int,
-    ) -> None:
-        """Record a completed trade."""
-        pos = self.position
-        total_pnl = pnl_tp1 + pnl_runner - costs
-        self.capital += total_pnl
-
-        rr_achieved = 0.0
-        if pos.sl_distance > 0:
-            rr_achieved = (exit_price - pos.entry_price) / pos.sl_distance
-
-        trade = {
-            "trade_num": self.trade_count,
-            "direction": "LONG",
-            "entry_time": pos.entry_time,
-            "entry_price": round(pos.entry_price, 2),
-            "stop_loss": round(pos.stop_loss, 2),
-            "sl_distance_pts": round(pos.sl_distance, 2),
-            "tp1_price": round(pos.tp1_price, 2),
-            "tp1_hit": tp1_hit,
-            "trail_stage": trail_stage,
-            "exit_time": exit_time,
-            "exit_price": round(exit_price, 2),
-            "exit_reason": exit_reason,
-            "entry_score": round(pos.entry_score, 2),
-            "entry_session": pos.entry_session,
-            "pnl_tp1": round(pnl_tp1, 2),
-            "pnl_runner": round(pnl_runner, 2),
-            "costs": round(costs, 2),
-            "total_pnl": round(total_pnl, 2),
-            "rr_achieved": round(rr_achieved, 2),
-            "capital_after": round(self.capital, 2),
+    def _trade_columns(self, trade_f, trade_i, long_score, sessions) -> dict:
+        """Turn the kernel's packed trade arrays into per-field trade columns.
+
+        All derived columns and the 2-dp rounding are done once per field
+        array. The columns back both trade_frame and the trade dicts.
+        """
+        n_trades = trade_f.shape[1]
+        entry_bars = trade_i[_I_ENTRY_BAR]
+        entry_price = trade_f[_F_ENTRY_PRICE]
+        exit_price = trade_f[_F_EXIT_PRICE]
+        sl_distance = trade_f[_F_SL_DISTANCE]
+        total_pnl = trade_f[_F_PNL_TP1] + trade_f[_F_PNL_RUNNER] - trade_f[_F_COSTS]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rr_achieved = np.where(
+                sl_distance > 0, (exit_price - entry_price) / sl_distance, 0.0,
+            )
+
+        # np.round matches the rounding the per-trade numpy scalars used to get
+        f = np.round(trade_f, 2)
+        return {
+            "trade_num": np.arange(1, n_trades + 1),
+            "direction": ["LONG"] * n_trades,
+            "entry_time": self.df.index[entry_bars],
+            "entry_price": f[_F_ENTRY_PRICE],
+            "stop_loss": f[_F_STOP_LOSS],
+            "sl_distance_pts": f[_F_SL_DISTANCE],
+            "tp1_price": f[_F_TP1_PRICE],
+            "tp1_hit": trade_i[_I_TP1_HIT].astype(bool),
+            "trail_stage": trade_i[_I_STAGE],
+            "exit_time": self.df.index[trade_i[_I_EXIT_BAR]],
+            "exit_price": f[_F_EXIT_PRICE],
+            "exit_reason": [_EXIT_REASONS[r] for r in trade_i[_I_REASON].tolist()],
+            "entry_score": np.round(long_score[entry_bars], 2),
+            "entry_session": sessions[entry_bars],
+            "pnl_tp1": f[_F_PNL_TP1],
+            "pnl_runner": f[_F_PNL_RUNNER],
+            "costs": f[_F_COSTS],
+            "total_pnl": np.round(total_pnl, 2),
+            "rr_achieved": np.round(rr_achieved, 2),
+            "capital_after": f[_F_CAPITAL],
         }
-        self.trades.append(trade)
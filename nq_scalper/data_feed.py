@@ -14,44 +14,131 @@ from config import DB_PATH, TIMEZONE
 
 logger = logging.getLogger(__name__)
 
+_EXPECTED_COLUMNS = frozenset({"Open", "High", "Low", "Close", "Volume"})
+
 
 def load_ohlcv(db_path: str, table: str) -> pd.DataFrame:
     """Load OHLCV data from SQLite *table*. Returns DataFrame with DatetimeIndex."""
     con = sqlite3.connect(db_path)
-    df = pd.read_sql(f"SELECT * FROM {table} ORDER BY datetime", con)
-    con.close()
+    try:
+        # Parse and index the datetime column while reading, instead of a
+        # to_datetime + set_index pass that copies the frame afterwards.
+        df = pd.read_sql_query(
+            f"SELECT * FROM {table} ORDER BY datetime", con,
+            index_col="datetime", parse_dates=["datetime"],
+        )
+    finally:
+        con.close()
     if df.empty:
         return df
-    df["datetime"] = pd.to_datetime(df["datetime"])
-    df = df.set_index("datetime")
     df = df.drop(columns=["fetched_at"], errors="ignore")
     df.columns = [c.capitalize() for c in df.columns]
+    missing = _EXPECTED_COLUMNS.difference(df.columns)
+    if missing:
+        logger.warning("Table %s is missing columns: %s", table, ", ".join(sorted(missing)))
     return df
 
 
-def load_15m_data(db_path: str = DB_PATH) -> pd.DataFrame:
+_CACHE_TABLE = "ohlcv_15m_cache"
+_CACHE_META_TABLE = "ohlcv_15m_cache_meta"
+_MIN_1M_BARS = 10_000  # below this the 1m table is not worth resampling
+
+
+def _read_15m_cache(con: sqlite3.Connection, source_key: tuple) -> pd.DataFrame | None:
+    """Return the cached 15m resample if it was built from *source_key*."""
+    try:
+        row = con.execute(
+            f"SELECT source_max, source_count FROM {_CACHE_META_TABLE}"
+        ).fetchone()
+    except sqlite3.OperationalError:  # no cache yet
+        return None
+    if row is None or tuple(row) != source_key:
+        return None
+    return pd.read_sql_query(
+        f"SELECT * FROM {_CACHE_TABLE} ORDER BY datetime", con,
+        index_col="datetime", parse_dates=["datetime"],
+    )
+
+
+def _write_15m_cache(db_path: str, df_15m: pd.DataFrame, source_key: tuple) -> None:
+    """Store *df_15m* as the resample of the 1m table at *source_key*.
+
+    The meta row is cleared first and written last, so a failed write
+    leaves no key pointing at a partial table.
+    """
+    con = sqlite3.connect(db_path)
+    try:
+        with con:
+            con.execute(
+                f"CREATE TABLE IF NOT EXISTS {_CACHE_META_TABLE} "
+                "(source_max TEXT, source_count INTEGER)"
+            )
+            con.execute(f"DELETE FROM {_CACHE_META_TABLE}")
+        df_15m.to_sql(_CACHE_TABLE, con, if_exists="replace", index_label="datetime")
+        with con:
+            con.execute(f"INSERT INTO {_CACHE_META_TABLE} VALUES (?, ?)", source_key)
+    finally:
+        con.close()
+
+
+def _load_resampled_15m(db_path: str, force_rebuild: bool) -> pd.DataFrame | None:
+    """15m bars resampled from ohlcv_1m, via the ohlcv_15m_cache table.
+
+    The cache is keyed on the 1m table's MAX(datetime) and COUNT(*), so
+    new 1m rows trigger a rebuild.  Returns None if there is too little
+    1m data.
+    """
+    con = sqlite3.connect(db_path)
+    try:
+        source_max, source_count = con.execute(
+            "SELECT MAX(datetime), COUNT(*) FROM ohlcv_1m"
+        ).fetchone()
+        if source_count <= _MIN_1M_BARS:
+            return None
+        source_key = (str(source_max), source_count)
+        if not force_rebuild:
+            df_15m = _read_15m_cache(con, source_key)
+            if df_15m is not None and not df_15m.empty:
+                logger.info(
+                    "Loaded %s cached 15m bars resampled from 1m (%s → %s)",
+                    f"{len(df_15m):,}", df_15m.index[0], df_15m.index[-1],
+                )
+                return df_15m
+    finally:
+        con.close()
+
+    df_1m = load_ohlcv(db_path, "ohlcv_1m")
+    logger.info("Found %s 1m bars in SQLite. Resampling to 15m...", f"{len(df_1m):,}")
+    agg = {
+        "Open": "first",
+        "High": "max",
+        "Low": "min",
+        "Close": "last",
+        "Volume": "sum",
+    }
+    df_15m = df_1m.resample("15min").agg(agg).dropna()
+    logger.info(
+        "Resampled to %s 15m bars (%s → %s)",
+        f"{len(df_15m):,}", df_15m.index[0], df_15m.index[-1],
+    )
+    try:
+        _write_15m_cache(db_path, df_15m, source_key)
+    except Exception as e:
+        logger.warning("Could not cache the 15m resample: %s", e)
+    return df_15m
+
+
+def load_15m_data(db_path: str = DB_PATH, force_rebuild: bool = False) -> pd.DataFrame:
     """Load 15-minute NQ data from the best available source.
 
-    Priority: 1m resample → existing 15m table.
-    Matches the Pine Script base timeframe (15 min).
+    Priority: 1m resample (cached in SQLite) → existing 15m table.
+    Matches the Pine Script base timeframe (15 min).  *force_rebuild*
+    ignores the cached resample.
     """
     # Try 1: Resample existing 1m data (gives most history)
     try:
-        df_1m = load_ohlcv(db_path, "ohlcv_1m")
-        if not df_1m.empty and len(df_1m) > 10_000:
-            logger.info("Found %s 1m bars in SQLite. Resampling to 15m...", f"{len(df_1m):,}")
-            agg = {
-                "Open": "first",
-                "High": "max",
-                "Low": "min",
-                "Close": "last",
-                "Volume": "sum",
-            }
-            df_15m = df_1m.resample("15min").agg(agg).dropna()
-            logger.info(
-                "Resampled to %s 15m bars (%s → %s)",
-                f"{len(df_15m):,}", df_15m.index[0], df_15m.index[-1],
-            )
+        df_15m = _load_resampled_15m(db_path, force_rebuild)
+        if df_15m is not None:
             return df_15m
     except Exception:
         pass
@@ -5,8 +5,10 @@ Usage:
     python generate_reports.py
 """
 
-import sys, os, io, time, base64, logging, warnings
+import sys, os, io, time, base64, hashlib, logging, warnings
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 from datetime import datetime
 
 if sys.platform == "win32":
@@ -21,6 +23,13 @@ import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+
+# let Agg draw very long equity/drawdown paths in chunks instead of failing
+# on its cell limit; no effect on paths shorter than the chunk size
+plt.rcParams["agg.path.chunksize"] = 10000
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 sys.path.insert(0, str(SCRIPT_DIR))
@@ -35,9 +44,7 @@ from scoring import (
     precompute_dynamic_thresholds, precompute_session_penalty,
     precompute_atr_adjustments, precompute_tech_sl,
 )
-from backtest_engine import BacktestEngine
-import risk_manager as rm_mod
-import scoring as sc_mod
+from backtest_engine import BacktestConfig, BacktestEngine, extract_arrays
 
 # ======================================================================
 OUT_DIR = str(SCRIPT_DIR / "output" / "reports")
@@ -52,12 +59,8 @@ IS_YEARS  = set(range(2016, 2024))
 OOS_YEARS = set(range(2024, 2026))
 
 
-def _patch(tp1, sl, risk):
-    cfg_mod.RR_RATIO_TP1 = tp1; cfg_mod.MAX_SL_POINTS = sl; cfg_mod.MAX_RISK_PER_CONTRACT = risk
-    rm_mod.RR_RATIO_TP1 = tp1; rm_mod.MAX_SL_POINTS = sl; sc_mod.MAX_SL_POINTS = sl
-
-def _restore():
-    _patch(1.5, 40.0, 800.0)
+def _backtest_config(cfg):
+    return BacktestConfig(rr_ratio_tp1=cfg["tp1_ratio"], max_sl_points=cfg["max_sl_pts"])
 
 
 def _et(ts):
@@ -79,23 +82,27 @@ def compute_stats(trades):
 
     df = pd.DataFrame(trades)
     n = len(df)
-    wins = int((df["total_pnl"] > 0).sum())
+    pnl = df["total_pnl"].to_numpy(dtype=np.float64)
+    is_win = pnl > 0
+    is_loss = ~is_win
+    win_pnl, loss_pnl = pnl[is_win], pnl[is_loss]
+    wins = len(win_pnl)
     losses = n - wins
     wr = 100.0 * wins / n
 
-    gp = df.loc[df["total_pnl"] > 0, "total_pnl"].sum()
-    gl = abs(df.loc[df["total_pnl"] <= 0, "total_pnl"].sum())
+    gp = win_pnl.sum()
+    gl = abs(loss_pnl.sum())
     pf = gp / gl if gl > 0 else 999.99
 
-    total_pnl = df["total_pnl"].sum()
-    avg_pnl = df["total_pnl"].mean()
-    avg_win = df.loc[df["total_pnl"] > 0, "total_pnl"].mean() if wins else 0
-    avg_loss = df.loc[df["total_pnl"] <= 0, "total_pnl"].mean() if losses else 0
+    total_pnl = pnl.sum()
+    avg_pnl = pnl.mean()
+    avg_win = win_pnl.mean() if wins else 0
+    avg_loss = loss_pnl.mean() if losses else 0
 
-    cum = df["total_pnl"].cumsum()
-    max_dd = float((cum - cum.cummax()).min())
+    cum = np.cumsum(pnl)
+    max_dd = float((cum - np.maximum.accumulate(cum)).min())
 
-    std = df["total_pnl"].std()
+    std = pnl.std(ddof=1) if n > 1 else np.nan
     sharpe = (avg_pnl / std) * np.sqrt(252) if std and std > 0 else 0
 
     tp1_hits = int(df["tp1_hit"].sum())
@@ -103,14 +110,11 @@ def compute_stats(trades):
     trail_s3 = int((df["exit_reason"] == "TRAIL_S3").sum())
 
     # streaks
-    is_win = (df["total_pnl"] > 0).astype(int).values
-    is_loss = (df["total_pnl"] <= 0).astype(int).values
     def max_streak(arr):
-        mx = cur = 0
-        for v in arr:
-            if v: cur += 1; mx = max(mx, cur)
-            else: cur = 0
-        return mx
+        # longest run of 1s: run starts/ends are the +1/-1 steps of the padded diff
+        edges = np.diff(np.concatenate(([0], np.asarray(arr, dtype=np.int8), [0])))
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        return int((ends - starts).max()) if len(starts) else 0
     max_cw = max_streak(is_win)
     max_cl = max_streak(is_loss)
 
@@ -125,31 +129,138 @@ def compute_stats(trades):
         max_consec_loss=max_cl, max_consec_win=max_cw,
         avg_sl_dist=round(df["sl_distance_pts"].mean(), 2),
         avg_tp1_dist=round((df["tp1_price"] - df["entry_price"]).mean(), 2),
-        median_pnl=round(df["total_pnl"].median(), 2),
-        best_trade=round(df["total_pnl"].max(), 2),
-        worst_trade=round(df["total_pnl"].min(), 2),
+        median_pnl=round(np.median(pnl), 2),
+        best_trade=round(pnl.max(), 2),
+        worst_trade=round(pnl.min(), 2),
         avg_rr=round(df["rr_achieved"].mean(), 2),
         avg_hold_bars=0,  # not tracked in trade dict
     )
 
 
+def _et_index(times):
+    # one index + one tz_convert for all timestamps (naive stays naive, as in _et)
+    idx = pd.DatetimeIndex(times)
+    return idx.tz_convert("US/Eastern") if idx.tz is not None else idx
+
+
 def filter_trades(trades, years):
-    return [t for t in trades if _et(t["entry_time"]).year in years]
+    if not trades:
+        return []
+    entry = _et_index([t["entry_time"] for t in trades])
+    keep = np.isin(entry.year.to_numpy(), list(years))
+    return [trades[i] for i in np.flatnonzero(keep)]
+
+
+class ChartData(NamedTuple):
+    """The trade fields the charts read, one array per field.
+
+    entry_time is converted to ET once, and its year/month/weekday are
+    taken from it once, so no chart converts a timestamp itself.  The
+    cumulative P&L and its drawdown are likewise shared by the equity and
+    drawdown charts.
+    """
+    pnl: np.ndarray
+    cum_pnl: np.ndarray
+    drawdown: np.ndarray
+    entry_time: pd.DatetimeIndex
+    years: np.ndarray
+    months: np.ndarray
+    dow: np.ndarray
+    exit_reason: np.ndarray
+    entry_session: np.ndarray
+    entry_score: np.ndarray
+    key: str  # content hash of the fields above, for _CHART_CACHE
+
+
+def _chart_data(trades):
+    n = len(trades)
+    pnl = np.fromiter((t["total_pnl"] for t in trades), dtype=np.float64, count=n)
+    entry_time = _et_index([t["entry_time"] for t in trades])
+    exit_reason = np.array([t["exit_reason"] for t in trades], dtype=object)
+    entry_session = np.array([t["entry_session"] for t in trades], dtype=object)
+    entry_score = np.fromiter((t["entry_score"] for t in trades), dtype=np.float64, count=n)
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(pnl.tobytes())
+    h.update(entry_time.asi8.tobytes())
+    h.update(str(entry_time.tz).encode())
+    h.update(entry_score.tobytes())
+    h.update("\0".join(map(str, exit_reason)).encode())
+    h.update("\0".join(map(str, entry_session)).encode())
+
+    cum_pnl = np.cumsum(pnl)
+    return ChartData(
+        pnl=pnl,
+        cum_pnl=cum_pnl,
+        drawdown=cum_pnl - np.maximum.accumulate(cum_pnl),
+        entry_time=entry_time,
+        years=entry_time.year.to_numpy(),
+        months=entry_time.month.to_numpy(),
+        dow=entry_time.dayofweek.to_numpy(),
+        exit_reason=exit_reason,
+        entry_session=entry_session,
+        entry_score=entry_score,
+        key=h.hexdigest(),
+    )
 
 
 # ======================================================================
 # CHART HELPERS (return base64-encoded PNG)
 # ======================================================================
 
+# One Figure (and Agg canvas) per process, cleared and resized for each chart
+# instead of building a new Figure, Axes and canvas every time
+_CHART_FIG = Figure()
+FigureCanvasAgg(_CHART_FIG)
+
+
+# Axes margins in inches, the same on every size: room for 7-digit P&L tick
+# labels plus the y label, 45-degree date labels and the title.  Charts are
+# saved at their full size (no tight bbox), so these keep labels on-canvas;
+# charts without those labels pass their own margins to _new_chart.
+_CHART_MARGINS = {"left": 1.15, "right": 0.3, "bottom": 0.8, "top": 0.5}
+
+
+def _new_chart(figsize, margins=None):
+    _CHART_FIG.clf()
+    _CHART_FIG.set_size_inches(figsize)
+    w, h = figsize
+    m = _CHART_MARGINS if margins is None else {**_CHART_MARGINS, **margins}
+    _CHART_FIG.subplots_adjust(left=m["left"] / w, right=1 - m["right"] / w,
+                               bottom=m["bottom"] / h, top=1 - m["top"] / h)
+    return _CHART_FIG, _CHART_FIG.add_subplot()
+
+
 def _fig_to_b64(fig):
     from io import BytesIO
     buf = BytesIO()
-    fig.savefig(buf, format="png", dpi=130, bbox_inches="tight", facecolor="#1a1a2e")
-    plt.close(fig)
+    # zlib level 1: these PNGs are inlined into the HTML, so encode time beats file size
+    # fixed figure sizes and _CHART_MARGINS: no bbox_inches="tight" pre-render pass
+    fig.savefig(buf, format="png", dpi=130, facecolor="#1a1a2e",
+                metadata={"Software": None}, pil_kwargs={"compress_level": 1})
     buf.seek(0)
     return base64.b64encode(buf.read()).decode("utf-8")
 
 
+_MAX_CURVE_POINTS = 5000
+
+
+def _curve_points(y):
+    """Indices of *y* worth plotting: all of them up to _MAX_CURVE_POINTS, else
+    the first and last point plus each bucket's min and max, so peaks and
+    troughs survive the down-sampling (plain striding can drop them)."""
+    n = len(y)
+    if n <= _MAX_CURVE_POINTS:
+        return np.arange(n)
+    size = -(-n // (_MAX_CURVE_POINTS // 2))
+    buckets = np.pad(y, (0, -n % size), mode="edge").reshape(-1, size)
+    starts = np.arange(0, buckets.size, size)
+    keep = np.concatenate((
+        [0, n - 1], starts + buckets.argmin(axis=1), starts + buckets.argmax(axis=1),
+    ))
+    return np.unique(np.minimum(keep, n - 1))
+
+
 def _style_ax(ax, title=""):
     ax.set_facecolor("#16213e")
     ax.figure.set_facecolor("#1a1a2e")
@@ -165,14 +276,14 @@ def _style_ax(ax, title=""):
     ax.grid(alpha=0.15, color="#666")
 
 
-def chart_equity_full(trades, name):
-    fig, ax = plt.subplots(figsize=(12, 5))
+def chart_equity_full(cd, name):
+    fig, ax = _new_chart((12, 5))
     _style_ax(ax, f"{name} Equity Curve (Full Period)")
-    if not trades:
+    if len(cd.pnl) == 0:
         return _fig_to_b64(fig)
-    pnls = [t["total_pnl"] for t in trades]
-    cum = np.cumsum(pnls) + 100_000
-    dates = [_et(t["entry_time"]) for t in trades]
+    pts = _curve_points(cd.cum_pnl)
+    cum = cd.cum_pnl[pts] + 100_000
+    dates = cd.entry_time[pts]
     ax.plot(dates, cum, color="#00d4aa", linewidth=1.3)
     ax.fill_between(dates, 100_000, cum, alpha=0.15, color="#00d4aa")
     ax.axhline(100_000, color="#666", ls="--", alpha=0.5)
@@ -180,63 +291,67 @@ def chart_equity_full(trades, name):
     ax.text(pd.Timestamp("2024-01-01", tz="US/Eastern"), max(cum)*0.98, " OOS", color="#ff6b6b", fontsize=9)
     ax.set_ylabel("Equity ($)", color="#ccc")
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y"))
-    plt.xticks(rotation=45)
+    ax.tick_params(axis="x", labelrotation=45)
     return _fig_to_b64(fig)
 
 
-def chart_equity_oos(trades, name):
-    fig, ax = plt.subplots(figsize=(12, 5))
+def chart_equity_oos(cd, name):
+    fig, ax = _new_chart((12, 5))
     _style_ax(ax, f"{name} Equity Curve (OOS 2024-2025)")
-    oos = filter_trades(trades, OOS_YEARS)
-    if not oos:
+    oos = np.isin(cd.years, list(OOS_YEARS))
+    if not oos.any():
         return _fig_to_b64(fig)
-    pnls = [t["total_pnl"] for t in oos]
-    cum = np.cumsum(pnls) + 100_000
-    dates = [_et(t["entry_time"]) for t in oos]
+    cum = np.cumsum(cd.pnl[oos]) + 100_000
+    dates = cd.entry_time[oos]
+    pts = _curve_points(cum)
+    cum, dates = cum[pts], dates[pts]
     ax.plot(dates, cum, color="#4ecdc4", linewidth=1.5)
     ax.fill_between(dates, 100_000, cum, alpha=0.15, color="#4ecdc4")
     ax.axhline(100_000, color="#666", ls="--", alpha=0.5)
     ax.set_ylabel("Equity ($)", color="#ccc")
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m"))
-    plt.xticks(rotation=45)
+    ax.tick_params(axis="x", labelrotation=45)
     return _fig_to_b64(fig)
 
 
-def chart_drawdown(trades, name):
-    fig, ax = plt.subplots(figsize=(12, 4))
+def chart_drawdown(cd, name):
+    fig, ax = _new_chart((12, 4))
     _style_ax(ax, f"{name} Drawdown Timeline")
-    if not trades:
+    if len(cd.pnl) == 0:
         return _fig_to_b64(fig)
-    pnls = [t["total_pnl"] for t in trades]
-    cum = np.cumsum(pnls)
-    peak = np.maximum.accumulate(cum)
-    dd = cum - peak
-    dates = [_et(t["entry_time"]) for t in trades]
+    pts = _curve_points(cd.drawdown)
+    dd = cd.drawdown[pts]
+    dates = cd.entry_time[pts]
     ax.fill_between(dates, dd, 0, color="#ff6b6b", alpha=0.4)
     ax.plot(dates, dd, color="#ff6b6b", linewidth=0.8)
     ax.axvline(pd.Timestamp("2024-01-01", tz="US/Eastern"), color="#ffd93d", ls="--", alpha=0.5)
     ax.set_ylabel("Drawdown ($)", color="#ccc")
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y"))
-    plt.xticks(rotation=45)
+    ax.tick_params(axis="x", labelrotation=45)
     return _fig_to_b64(fig)
 
 
-def chart_monthly_heatmap(trades, name):
-    fig, ax = plt.subplots(figsize=(12, 6))
+# Month labels only, no y label or rotated dates; the colourbar's own
+# fraction/pad already leaves room on the right for its tick labels
+_HEATMAP_MARGINS = {"left": 0.8, "right": 0.0, "bottom": 0.5}
+
+
+def chart_monthly_heatmap(cd, name):
+    fig, ax = _new_chart((12, 6), _HEATMAP_MARGINS)
     ax.set_facecolor("#16213e")
     fig.set_facecolor("#1a1a2e")
-    if not trades:
+    if len(cd.pnl) == 0:
         return _fig_to_b64(fig)
 
-    years_set = sorted(set(_et(t["entry_time"]).year for t in trades))
-    data = np.full((12, len(years_set)), np.nan)
-    for t in trades:
-        et = _et(t["entry_time"])
-        yi = years_set.index(et.year)
-        mi = et.month - 1
-        if np.isnan(data[mi, yi]):
-            data[mi, yi] = 0
-        data[mi, yi] += t["total_pnl"]
+    years_set, yi = np.unique(cd.years, return_inverse=True)
+    years_set = years_set.tolist()
+    mi = cd.months - 1
+    # np.add.at sums in trade order, like the per-trade += it replaces
+    data = np.zeros((12, len(years_set)))
+    np.add.at(data, (mi, yi), cd.pnl)
+    has_trades = np.zeros(data.shape, dtype=bool)
+    has_trades[mi, yi] = True
+    data[~has_trades] = np.nan
 
     masked = np.ma.masked_invalid(data)
     vmax = max(abs(np.nanmin(data)), abs(np.nanmax(data)), 1)
@@ -245,26 +360,29 @@ def chart_monthly_heatmap(trades, name):
     ax.set_xticklabels(years_set, color="#ccc")
     ax.set_yticks(range(12))
     ax.set_yticklabels(["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"], color="#ccc")
-    for i in range(12):
-        for j in range(len(years_set)):
-            v = data[i, j]
-            if not np.isnan(v):
-                tc = "white" if abs(v) > vmax * 0.4 else "black"
-                ax.text(j, i, f"${v:,.0f}", ha="center", va="center", fontsize=6.5, color=tc, fontweight="bold")
+    # label only months with trades whose P&L shows as more than $0 (NaN compares False)
+    for i, j in zip(*np.nonzero(np.abs(data) >= 0.5)):
+        v = data[i, j]
+        tc = "white" if abs(v) > vmax * 0.4 else "black"
+        ax.text(j, i, f"${v:,.0f}", ha="center", va="center", fontsize=6.5, color=tc, fontweight="bold")
     ax.set_title(f"{name} Monthly P&L Heatmap", color="white", fontweight="bold", fontsize=12, pad=10)
-    cb = plt.colorbar(im, ax=ax)
+    cb = fig.colorbar(im, ax=ax)
     cb.ax.yaxis.set_tick_params(color="#ccc")
     plt.setp(plt.getp(cb.ax.axes, "yticklabels"), color="#ccc")
     return _fig_to_b64(fig)
 
 
-def chart_exit_pie(trades, name, period="Full"):
-    fig, ax = plt.subplots(figsize=(6, 5))
+# The pie has no axis labels, only wedge labels around it: centre it
+_PIE_MARGINS = {"left": 0.6, "right": 0.6, "bottom": 0.3, "top": 0.5}
+
+
+def chart_exit_pie(cd, name, period="Full"):
+    fig, ax = _new_chart((6, 5), _PIE_MARGINS)
     fig.set_facecolor("#1a1a2e")
     ax.set_facecolor("#1a1a2e")
-    if not trades:
+    if len(cd.pnl) == 0:
         return _fig_to_b64(fig)
-    reasons = pd.Series([t["exit_reason"] for t in trades]).value_counts()
+    reasons = pd.Series(cd.exit_reason).value_counts()
     colors_map = {"FULL_STOP":"#e74c3c","TRAIL_S1":"#f39c12","TRAIL_S2":"#2ecc71","TRAIL_S3":"#27ae60","EOD_CLOSE":"#95a5a6"}
     cols = [colors_map.get(r, "#777") for r in reasons.index]
     wedges, texts, autotexts = ax.pie(reasons.values, labels=reasons.index, autopct="%1.1f%%",
@@ -276,31 +394,36 @@ def chart_exit_pie(trades, name, period="Full"):
     return _fig_to_b64(fig)
 
 
-def chart_pnl_distribution(trades, name):
-    fig, ax = plt.subplots(figsize=(10, 4))
+def chart_pnl_distribution(cd, name):
+    fig, ax = _new_chart((10, 4))
     _style_ax(ax, f"{name} Trade P&L Distribution")
-    if not trades:
+    if len(cd.pnl) == 0:
         return _fig_to_b64(fig)
-    pnls = [t["total_pnl"] for t in trades]
-    colors_arr = ["#2ecc71" if p > 0 else "#e74c3c" for p in pnls]
-    ax.bar(range(len(pnls)), pnls, color=colors_arr, width=1.0, edgecolor="none")
+    pnls = cd.pnl
+    colors_arr = np.where(pnls > 0, "#2ecc71", "#e74c3c").tolist()
+    # the same unit-width bars as ax.bar, but one collection instead of a patch per trade
+    x = np.arange(len(pnls), dtype=np.float64)
+    zero = np.zeros_like(pnls)
+    verts = np.stack([np.column_stack([x - 0.5, zero]), np.column_stack([x - 0.5, pnls]),
+                      np.column_stack([x + 0.5, pnls]), np.column_stack([x + 0.5, zero])], axis=1)
+    bars = PolyCollection(verts, facecolors=colors_arr, edgecolors="none", linewidths=0)
+    bars.sticky_edges.y.append(0)
+    ax.add_collection(bars)
+    ax.autoscale_view()
     ax.axhline(0, color="#666", linewidth=0.5)
     ax.set_xlabel("Trade #", color="#ccc")
     ax.set_ylabel("P&L ($)", color="#ccc")
     return _fig_to_b64(fig)
 
 
-def chart_yearly_bars(trades, name):
-    fig, ax = plt.subplots(figsize=(10, 5))
+def chart_yearly_bars(cd, name):
+    fig, ax = _new_chart((10, 5))
     _style_ax(ax, f"{name} Yearly P&L")
-    if not trades:
+    if len(cd.pnl) == 0:
         return _fig_to_b64(fig)
-    yearly = {}
-    for t in trades:
-        yr = _et(t["entry_time"]).year
-        yearly[yr] = yearly.get(yr, 0) + t["total_pnl"]
-    years = sorted(yearly.keys())
-    vals = [yearly[y] for y in years]
+    years, yi = np.unique(cd.years, return_inverse=True)
+    years = years.tolist()
+    vals = np.bincount(yi, weights=cd.pnl).tolist()
     cols = ["#2ecc71" if v > 0 else "#e74c3c" for v in vals]
     bars = ax.bar(years, vals, color=cols, edgecolor="#333", linewidth=0.5)
     for b, v in zip(bars, vals):
@@ -311,33 +434,35 @@ def chart_yearly_bars(trades, name):
     return _fig_to_b64(fig)
 
 
-def chart_rolling_wr(trades, name, window=10):
-    fig, ax = plt.subplots(figsize=(12, 4))
+def chart_rolling_wr(cd, name, window=10):
+    fig, ax = _new_chart((12, 4))
     _style_ax(ax, f"{name} Rolling {window}-Trade Win Rate")
-    if len(trades) < window:
+    if len(cd.pnl) < window:
         return _fig_to_b64(fig)
-    wins = [1 if t["total_pnl"] > 0 else 0 for t in trades]
-    rwr = pd.Series(wins).rolling(window).mean() * 100
-    dates = [_et(t["entry_time"]) for t in trades]
-    ax.plot(dates, rwr.values, color="#4ecdc4", linewidth=1.2)
+    # window sums as differences of one running win count; the first
+    # window-1 trades stay NaN, as with a pandas rolling mean
+    cs = np.concatenate(([0], np.cumsum(cd.pnl > 0)))
+    rwr = np.full(len(cd.pnl), np.nan)
+    rwr[window - 1:] = (cs[window:] - cs[:-window]) / window * 100
+    dates = cd.entry_time
+    ax.plot(dates, rwr, color="#4ecdc4", linewidth=1.2)
     ax.axhline(50, color="#ffd93d", ls="--", alpha=0.5)
     ax.set_ylabel("Win Rate (%)", color="#ccc")
     ax.set_ylim(0, 100)
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y"))
-    plt.xticks(rotation=45)
+    ax.tick_params(axis="x", labelrotation=45)
     return _fig_to_b64(fig)
 
 
-def chart_score_vs_pnl(trades, name):
-    fig, ax = plt.subplots(figsize=(8, 5))
+def chart_score_vs_pnl(cd, name):
+    fig, ax = _new_chart((8, 5))
     _style_ax(ax, f"{name} Entry Score vs P&L")
-    if not trades:
+    if len(cd.pnl) == 0:
         return _fig_to_b64(fig)
-    df = pd.DataFrame(trades)
-    wins = df[df["total_pnl"] > 0]
-    losses = df[df["total_pnl"] <= 0]
-    ax.scatter(wins["entry_score"], wins["total_pnl"], c="#2ecc71", alpha=0.6, s=30, edgecolors="none", label="Win")
-    ax.scatter(losses["entry_score"], losses["total_pnl"], c="#e74c3c", alpha=0.6, s=30, edgecolors="none", label="Loss")
+    pnl, score = cd.pnl, cd.entry_score
+    win = pnl > 0
+    ax.scatter(score[win], pnl[win], c="#2ecc71", alpha=0.6, s=30, edgecolors="none", label="Win")
+    ax.scatter(score[~win], pnl[~win], c="#e74c3c", alpha=0.6, s=30, edgecolors="none", label="Loss")
     ax.axhline(0, color="#666", linewidth=0.5)
     ax.set_xlabel("Entry Score", color="#ccc")
     ax.set_ylabel("P&L ($)", color="#ccc")
@@ -345,17 +470,14 @@ def chart_score_vs_pnl(trades, name):
     return _fig_to_b64(fig)
 
 
-def chart_session_bars(trades, name):
-    fig, ax = plt.subplots(figsize=(6, 4))
+def chart_session_bars(cd, name):
+    fig, ax = _new_chart((6, 4))
     _style_ax(ax, f"{name} P&L by Session")
-    if not trades:
+    if len(cd.pnl) == 0:
         return _fig_to_b64(fig)
-    sess_pnl = {}
-    for t in trades:
-        s = t["entry_session"]
-        sess_pnl[s] = sess_pnl.get(s, 0) + t["total_pnl"]
-    sessions = sorted(sess_pnl.keys())
-    vals = [sess_pnl[s] for s in sessions]
+    sessions, si = np.unique(cd.entry_session, return_inverse=True)
+    sessions = sessions.tolist()
+    vals = np.bincount(si, weights=cd.pnl).tolist()
     cols = ["#2ecc71" if v > 0 else "#e74c3c" for v in vals]
     ax.bar(sessions, vals, color=cols, edgecolor="#333")
     ax.axhline(0, color="#666", linewidth=0.5)
@@ -363,18 +485,13 @@ def chart_session_bars(trades, name):
     return _fig_to_b64(fig)
 
 
-def chart_dow_bars(trades, name):
-    fig, ax = plt.subplots(figsize=(8, 4))
+def chart_dow_bars(cd, name):
+    fig, ax = _new_chart((8, 4))
     _style_ax(ax, f"{name} P&L by Day of Week")
-    if not trades:
+    if len(cd.pnl) == 0:
         return _fig_to_b64(fig)
-    dow_pnl = {i: 0 for i in range(5)}
-    for t in trades:
-        d = _et(t["entry_time"]).dayofweek
-        if d < 5:
-            dow_pnl[d] += t["total_pnl"]
     labels = DAYS[:5]
-    vals = [dow_pnl[i] for i in range(5)]
+    vals = np.bincount(cd.dow, weights=cd.pnl, minlength=7)[:5].tolist()
     cols = ["#2ecc71" if v > 0 else "#e74c3c" for v in vals]
     ax.bar(labels, vals, color=cols, edgecolor="#333")
     ax.axhline(0, color="#666", linewidth=0.5)
@@ -968,6 +1085,99 @@ def export_full_trade_csv(trades, name, cfg):
 # MAIN
 # ======================================================================
 
+def chart_jobs(name, trades):
+    """(chart key, chart function, args) for every chart of one report.
+
+    The args are ChartData arrays and strings, so each job can be sent to
+    a worker process on its own.
+    """
+    cd = _chart_data(trades)
+    cd_is = _chart_data(filter_trades(trades, IS_YEARS))
+    cd_oos = _chart_data(filter_trades(trades, OOS_YEARS))
+    return [
+        ("equity_full",     chart_equity_full,      (cd, name)),
+        ("equity_oos",      chart_equity_oos,       (cd, name)),
+        ("drawdown",        chart_drawdown,         (cd, name)),
+        ("pnl_dist",        chart_pnl_distribution, (cd, name)),
+        ("yearly_bars",     chart_yearly_bars,      (cd, name)),
+        ("monthly_heatmap", chart_monthly_heatmap,  (cd, name)),
+        ("exit_pie_is",     chart_exit_pie,         (cd_is, name, "IS")),
+        ("exit_pie_oos",    chart_exit_pie,         (cd_oos, name, "OOS")),
+        ("session_bars",    chart_session_bars,     (cd, name)),
+        ("dow_bars",        chart_dow_bars,         (cd, name)),
+        ("score_pnl",       chart_score_vs_pnl,     (cd, name)),
+        ("rolling_wr",      chart_rolling_wr,       (cd, name)),
+    ]
+
+
+# Rendered charts by (chart function, ChartData.key, other args), so re-rendering
+# the same trades (repeat runs in one session, configs with identical trades)
+# skips the drawing.  Lives in the parent; the oldest entry goes first.
+_CHART_CACHE = {}
+_CHART_CACHE_SIZE = 64
+
+
+def _chart_cache_key(fn, args):
+    return (fn.__name__,) + tuple(a.key if isinstance(a, ChartData) else a for a in args)
+
+
+def _cache_chart(cache_key, b64):
+    if len(_CHART_CACHE) >= _CHART_CACHE_SIZE:
+        del _CHART_CACHE[next(iter(_CHART_CACHE))]
+    _CHART_CACHE[cache_key] = b64
+
+
+def write_report(name, cfg, trades, charts):
+    """HTML report (with the rendered *charts*) and trade-log CSV; returns both paths."""
+    html = generate_html_report(name, cfg, trades, charts)
+    html_path = os.path.join(OUT_DIR, f"{name}_report.html")
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(html)
+
+    csv_path = export_full_trade_csv(trades, name, cfg)
+    return html_path, csv_path
+
+
+def render_reports(name, cfg, trades):
+    """Charts, HTML report and trade-log CSV for one config, in this process."""
+    charts = {}
+    for key, fn, args in chart_jobs(name, trades):
+        cache_key = _chart_cache_key(fn, args)
+        if cache_key not in _CHART_CACHE:
+            _cache_chart(cache_key, fn(*args))
+        charts[key] = _CHART_CACHE[cache_key]
+    return write_report(name, cfg, trades, charts)
+
+
+def render_reports_parallel(results):
+    """render_reports for every config in *results*, with every chart of every
+    report as its own job in one process pool; returns {name: (html, csv)}.
+    On a single CPU the pool only adds pickling, so it renders in-process."""
+    workers = os.cpu_count() or 1
+    if workers == 1:
+        return {name: render_reports(name, CONFIGS[name], results[name]) for name in results}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # cached charts are reused; each distinct missing chart is submitted once
+        rendered, pending, jobs = {}, {}, {}
+        for name in results:
+            jobs[name] = []
+            for key, fn, args in chart_jobs(name, results[name]):
+                cache_key = _chart_cache_key(fn, args)
+                if cache_key in _CHART_CACHE:
+                    rendered[cache_key] = _CHART_CACHE[cache_key]
+                elif cache_key not in pending:
+                    pending[cache_key] = pool.submit(fn, *args)
+                jobs[name].append((key, cache_key))
+        paths = {}
+        for name, chart_keys in jobs.items():
+            for cache_key in (ck for _, ck in chart_keys if ck in pending):
+                rendered[cache_key] = pending.pop(cache_key).result()
+                _cache_chart(cache_key, rendered[cache_key])
+            charts = {key: rendered[cache_key] for key, cache_key in chart_keys}
+            paths[name] = write_report(name, CONFIGS[name], results[name], charts)
+    return paths
+
+
 def main():
     os.makedirs(OUT_DIR, exist_ok=True)
 
@@ -997,56 +1207,32 @@ def main():
     df["effective_thresh"] = df["long_thresh"] + df["session_penalty"] + df["atr_adj"]
     df = df.iloc[cfg_mod.WARM_UP_BARS:]
 
-    # Tech SL 50pt
-    sc_mod.MAX_SL_POINTS = 50.0
-    tech_sl = precompute_tech_sl(df)
-    _restore()
+    # Kernel inputs are extracted once and shared by every config; only
+    # the tech SL depends on the config's SL cap
+    arrays = extract_arrays(df)
+    tech_sl = {}
+    for cfg in CONFIGS.values():
+        sl = cfg["max_sl_pts"]
+        if sl not in tech_sl:
+            tech_sl[sl] = precompute_tech_sl(df, max_sl_points=sl).to_numpy(dtype=np.float64)
 
     # Run backtests
     print("[2] Running backtests...")
     results = {}
     for name, cfg in CONFIGS.items():
         print(f"  {name}...", end=" ", flush=True)
-        _patch(cfg["tp1_ratio"], cfg["max_sl_pts"], cfg["max_risk"])
-        d = df.copy()
-        d["tech_sl_long"] = tech_sl
-        engine = BacktestEngine(d)
+        engine = BacktestEngine(
+            df, {**arrays, "tech_sl_long": tech_sl[cfg["max_sl_pts"]]},
+            config=_backtest_config(cfg),
+        )
         trades = engine.run()
-        _restore()
         results[name] = trades
         print(f"{len(trades)} trades")
 
-    # Generate reports
+    # Generate reports; every chart is a separate job in one process pool
     print("[3] Generating charts & HTML reports...")
-    for name, cfg in CONFIGS.items():
-        trades = results[name]
-        is_trades  = filter_trades(trades, IS_YEARS)
-        oos_trades = filter_trades(trades, OOS_YEARS)
-
-        print(f"  {name}: generating charts...", end=" ", flush=True)
-        charts = {
-            "equity_full":     chart_equity_full(trades, name),
-            "equity_oos":      chart_equity_oos(trades, name),
-            "drawdown":        chart_drawdown(trades, name),
-            "pnl_dist":        chart_pnl_distribution(trades, name),
-            "yearly_bars":     chart_yearly_bars(trades, name),
-            "monthly_heatmap": chart_monthly_heatmap(trades, name),
-            "exit_pie_is":     chart_exit_pie(is_trades, name, "IS"),
-            "exit_pie_oos":    chart_exit_pie(oos_trades, name, "OOS"),
-            "session_bars":    chart_session_bars(trades, name),
-            "dow_bars":        chart_dow_bars(trades, name),
-            "score_pnl":       chart_score_vs_pnl(trades, name),
-            "rolling_wr":      chart_rolling_wr(trades, name),
-        }
-        print("HTML...", end=" ", flush=True)
-
-        html = generate_html_report(name, cfg, trades, charts)
-        html_path = os.path.join(OUT_DIR, f"{name}_report.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html)
-
-        csv_path = export_full_trade_csv(trades, name, cfg)
-        print(f"done.")
+    for name, (html_path, csv_path) in render_reports_parallel(results).items():
+        print(f"  {name}: done.")
         print(f"    HTML: {html_path}")
         print(f"    CSV:  {csv_path}")
 
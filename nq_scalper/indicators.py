@@ -159,14 +159,36 @@ def get_session_labels(df: pd.DataFrame) -> pd.Series:
     return sessions
 
 
+# int8 session codes, in label order; codes >= SESSION_EUROPE are tradeable
+SESSION_LABELS = ("Maintenance", "Closed", "Europe", "US", "Asia", "After Hours")
+SESSION_CODES = {label: code for code, label in enumerate(SESSION_LABELS)}
+SESSION_EUROPE = SESSION_CODES["Europe"]
+
+
+def get_session_codes(sessions: pd.Series) -> np.ndarray:
+    """Map session labels to SESSION_CODES (unknown labels trade like US)."""
+    return (
+        sessions.map(SESSION_CODES).fillna(SESSION_CODES["US"])
+        .to_numpy(dtype=np.int8)
+    )
+
+
 def get_et_components(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-    """Return (ET_hour, ET_minute, day_of_week) arrays for all bars."""
+    """Return (ET_hour, ET_minute, day_of_week) arrays for all bars.
+
+    One vectorised tz conversion for the whole index; hour/minute come
+    back as int16 and day_of_week as int8.
+    """
     idx = df.index
     if idx.tz is None:
         idx = idx.tz_localize("UTC").tz_convert(TIMEZONE)
     else:
         idx = idx.tz_convert(TIMEZONE)
-    return idx.hour.values, idx.minute.values, idx.dayofweek.values
+    return (
+        idx.hour.to_numpy(dtype=np.int16),
+        idx.minute.to_numpy(dtype=np.int16),
+        idx.dayofweek.to_numpy(dtype=np.int8),
+    )
 
 
 # ═══════════════════════════════════════════════════════════════════
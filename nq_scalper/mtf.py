@@ -50,16 +50,19 @@ def compute_daily_mtf(df_d: pd.DataFrame) -> pd.DataFrame:
 
 
 def merge_mtf(df_base, df_higher, cols):
-    """Merge higher-TF columns onto base bars with 1-bar lag (no look-ahead)."""
-    df_lagged = df_higher[cols].shift(1).copy()
-    if df_base.index.tz is not None:
-        df_base = df_base.copy()
-        df_base.index = df_base.index.tz_localize(None)
+    """Align higher-TF columns onto base bars with 1-bar lag (no look-ahead).
+
+    Each base bar takes the last lagged higher-TF row at or before it, the
+    same as a backward pd.merge_asof. Returns just the aligned *cols*,
+    indexed like *df_base*, so build_mtf can attach every timeframe in one
+    concat instead of rebuilding the wide 15m frame once per merge.
+    """
+    df_lagged = df_higher[cols].shift(1)
     if df_lagged.index.tz is not None:
         df_lagged.index = df_lagged.index.tz_localize(None)
-    df_base = df_base.sort_index()
-    df_lagged = df_lagged.sort_index()
-    return pd.merge_asof(df_base, df_lagged, left_index=True, right_index=True, direction="backward")
+    if not df_lagged.index.is_monotonic_increasing:
+        df_lagged = df_lagged.sort_index()
+    return df_lagged.reindex(df_base.index, method="ffill")
 
 
 def compute_mtf_flags(df: pd.DataFrame) -> pd.DataFrame:
@@ -115,14 +118,22 @@ def build_mtf(df_15m: pd.DataFrame) -> pd.DataFrame:
     logger.info("Computing Daily indicators...")
     df_d = compute_daily_mtf(df_d)
 
-    logger.info("Merging 1H MTF onto 15m...")
-    df = merge_mtf(df_15m, df_1h, ["mtf1h_ema9", "mtf1h_ema21", "mtf1h_ema50", "mtf1h_close"])
-    logger.info("Merging 4H MTF onto 15m...")
-    df = merge_mtf(df, df_4h, ["mtf4h_ema50", "mtf4h_ema200", "mtf4h_close"])
-    logger.info("Merging Daily levels onto 15m...")
-    df = merge_mtf(df, df_d, ["daily_ema50", "daily_ema200", "prev_day_high", "prev_day_low", "prev_day_close"])
-    logger.info("Merging Weekly levels onto 15m...")
-    df = merge_mtf(df, df_w, ["prev_week_high", "prev_week_low"])
+    # Merge on a tz-naive, sorted 15m index
+    df = df_15m
+    if df.index.tz is not None:
+        df = df.copy()
+        df.index = df.index.tz_localize(None)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    logger.info("Merging 1H/4H/Daily/Weekly MTF onto 15m...")
+    df = pd.concat([
+        df,
+        merge_mtf(df, df_1h, ["mtf1h_ema9", "mtf1h_ema21", "mtf1h_ema50", "mtf1h_close"]),
+        merge_mtf(df, df_4h, ["mtf4h_ema50", "mtf4h_ema200", "mtf4h_close"]),
+        merge_mtf(df, df_d, ["daily_ema50", "daily_ema200", "prev_day_high", "prev_day_low", "prev_day_close"]),
+        merge_mtf(df, df_w, ["prev_week_high", "prev_week_low"]),
+    ], axis=1)
 
     df = compute_mtf_flags(df)
     return df
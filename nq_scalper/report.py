@@ -16,6 +16,7 @@ import numpy as np
 import pandas as pd
 
 from config import OUTPUT_DIR, INITIAL_CAPITAL
+from trade_logger import as_trade_frame
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +25,12 @@ logger = logging.getLogger(__name__)
 # ANALYSIS
 # ═══════════════════════════════════════════════════════════════════
 
-def analyze_results(trades: list[dict], equity_curve: list[float]) -> dict:
+def analyze_results(trades: list[dict] | pd.DataFrame, equity_curve: np.ndarray) -> dict:
     """Compute comprehensive backtest statistics."""
-    if not trades:
+    if len(trades) == 0:
         return {"total_trades": 0}
 
-    df = pd.DataFrame(trades)
+    df = as_trade_frame(trades)
     total = len(df)
     wins = len(df[df["total_pnl"] > 0])
     losses = total - wins
@@ -168,12 +169,12 @@ def print_summary(stats: dict) -> None:
     print("\n".join(lines))
 
 
-def print_year_breakdown(trades: list[dict]) -> None:
+def print_year_breakdown(trades: list[dict] | pd.DataFrame) -> None:
     """Print year-by-year P&L breakdown."""
-    if not trades:
+    if len(trades) == 0:
         return
-    df = pd.DataFrame(trades)
-    df["year"] = pd.to_datetime(df["entry_time"]).dt.year
+    df = as_trade_frame(trades)
+    year = pd.to_datetime(df["entry_time"]).dt.year.rename("year")
     sep = "-" * 60
 
     print(f"\n  Year-by-Year Breakdown:")
@@ -181,7 +182,7 @@ def print_year_breakdown(trades: list[dict]) -> None:
     print(f"  {'Year':<6} {'Trades':>7} {'Wins':>6} {'WR':>7} {'PF':>7} {'P&L':>12}")
     print(f"  {sep}")
 
-    for year, grp in df.groupby("year"):
+    for year, grp in df.groupby(year):
         n = len(grp)
         w = len(grp[grp["total_pnl"] > 0])
         wr = 100.0 * w / n if n > 0 else 0
@@ -194,11 +195,11 @@ def print_year_breakdown(trades: list[dict]) -> None:
     print(f"  {sep}")
 
 
-def print_score_buckets(trades: list[dict]) -> None:
+def print_score_buckets(trades: list[dict] | pd.DataFrame) -> None:
     """Print score bucket analysis."""
-    if not trades:
+    if len(trades) == 0:
         return
-    df = pd.DataFrame(trades)
+    df = as_trade_frame(trades)
 
     buckets = [
         ("7.0-7.9", 7.0, 7.9999),
@@ -230,12 +231,12 @@ def print_score_buckets(trades: list[dict]) -> None:
     print(f"  {sep}")
 
 
-def print_dow_analysis(trades: list[dict]) -> None:
+def print_dow_analysis(trades: list[dict] | pd.DataFrame) -> None:
     """Print day-of-week analysis."""
-    if not trades:
+    if len(trades) == 0:
         return
-    df = pd.DataFrame(trades)
-    df["dow"] = pd.to_datetime(df["entry_time"]).dt.day_name()
+    df = as_trade_frame(trades)
+    dow = pd.to_datetime(df["entry_time"]).dt.day_name()
     dow_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
 
     sep = "-" * 60
@@ -245,7 +246,7 @@ def print_dow_analysis(trades: list[dict]) -> None:
     print(f"  {sep}")
 
     for day in dow_order:
-        grp = df[df["dow"] == day]
+        grp = df[dow == day]
         n = len(grp)
         if n == 0:
             continue
@@ -261,14 +262,14 @@ def print_dow_analysis(trades: list[dict]) -> None:
 # CHARTS
 # ═══════════════════════════════════════════════════════════════════
 
-def generate_charts(trades: list[dict], equity_curve: list[float], prefix: str = "") -> None:
+def generate_charts(trades: list[dict] | pd.DataFrame, equity_curve: np.ndarray, prefix: str = "") -> None:
     """Generate all performance charts and save to output directory."""
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    if not trades:
+    if len(trades) == 0:
         logger.warning("No trades to chart.")
         return
 
-    df = pd.DataFrame(trades)
+    df = as_trade_frame(trades)
 
     # --- 1. Equity Curve ---
     _plot_equity_curve(equity_curve, prefix=prefix)
@@ -283,7 +284,7 @@ def generate_charts(trades: list[dict], equity_curve: list[float], prefix: str =
     _plot_exit_reasons(df, prefix=prefix)
 
 
-def _plot_equity_curve(equity_curve: list[float], prefix: str = "") -> None:
+def _plot_equity_curve(equity_curve: np.ndarray, prefix: str = "") -> None:
     """Plot and save the equity curve."""
     fig, ax = plt.subplots(figsize=(14, 6))
     ax.plot(equity_curve, linewidth=1, color="#2ecc71")
@@ -412,7 +413,7 @@ def print_verification_table(stats: dict) -> None:
     print(sep)
 
 
-def print_before_after_comparison(stats: dict, trades: list[dict]) -> None:
+def print_before_after_comparison(stats: dict, trades: list[dict] | pd.DataFrame) -> None:
     """Print before/after comparison table with the known pre-fix values."""
     # Known pre-fix values from diagnostic
     before = {
@@ -133,6 +133,8 @@ def main() -> None:
     engine = BacktestEngine(df)
     trades = engine.run()
     equity_curve = engine.equity_curve
+    # Columnar trade log shared by the CSV export, stats and charts
+    trade_frame = engine.trade_frame
 
     t_backtest = time.time()
     logger.info("Backtest execution took %.1f seconds", t_backtest - t_prep)
@@ -142,21 +144,21 @@ def main() -> None:
         return
 
     # Export trade log (fixed version)
-    csv_path = export_trades_csv(trades, filename="trades_fixed.csv")
+    csv_path = export_trades_csv(trade_frame, filename="trades_fixed.csv")
 
     # Analyze and report
-    stats = analyze_results(trades, equity_curve)
+    stats = analyze_results(trade_frame, equity_curve)
     print_summary(stats)
-    print_year_breakdown(trades)
-    print_score_buckets(trades)
-    print_dow_analysis(trades)
+    print_year_breakdown(trade_frame)
+    print_score_buckets(trade_frame)
+    print_dow_analysis(trade_frame)
     print_verification_table(stats)
-    print_before_after_comparison(stats, trades)
+    print_before_after_comparison(stats, trade_frame)
 
     # Generate charts (fixed versions)
     if not args.no_charts:
         logger.info("Generating charts...")
-        generate_charts(trades, equity_curve, prefix="fixed_")
+        generate_charts(trade_frame, equity_curve, prefix="fixed_")
 
     t_end = time.time()
     print(f"\n  Total runtime: {t_end - t_start:.1f} seconds")
@@ -155,10 +155,11 @@ def precompute_atr_adjustments(atr_pctile: pd.Series) -> pd.Series:
 # TECHNICAL STOP LOSS LEVELS
 # ═══════════════════════════════════════════════════════════════════
 
-def precompute_tech_sl(df: pd.DataFrame) -> pd.Series:
+def precompute_tech_sl(df: pd.DataFrame, max_sl_points: float = MAX_SL_POINTS) -> pd.Series:
     """Precompute technical stop-loss levels for long entries.
 
-    SL = min(recent_low, supertrend_or_atr_buffer), capped at 40 pts from close.
+    SL = min(recent_low, supertrend_or_atr_buffer), capped at
+    *max_sl_points* (default 40 pts) from close.
     """
     low_n = df["Low"].rolling(window=PIVOT_LOOKBACK, min_periods=1).min()
 
@@ -171,8 +172,8 @@ def precompute_tech_sl(df: pd.DataFrame) -> pd.Series:
         ),
     )
 
-    # Cap: SL cannot be more than MAX_SL_POINTS below close
-    tech_sl = np.maximum(tech_sl, df["Close"].values - MAX_SL_POINTS)
+    # Cap: SL cannot be more than max_sl_points below close
+    tech_sl = np.maximum(tech_sl, df["Close"].values - max_sl_points)
 
     return pd.Series(tech_sl, index=df.index)
 
@@ -10,11 +10,16 @@ from config import OUTPUT_DIR
 logger = logging.getLogger(__name__)
 
 
-def export_trades_csv(trades: list[dict], filename: str = "trades.csv") -> str:
+def as_trade_frame(trades: list[dict] | pd.DataFrame) -> pd.DataFrame:
+    """Trade dicts as a DataFrame; BacktestEngine.trade_frame is used as-is."""
+    return trades if isinstance(trades, pd.DataFrame) else pd.DataFrame(trades)
+
+
+def export_trades_csv(trades: list[dict] | pd.DataFrame, filename: str = "trades.csv") -> str:
     """Export trade log to CSV. Returns the file path."""
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     path = os.path.join(OUTPUT_DIR, filename)
-    df = pd.DataFrame(trades)
+    df = as_trade_frame(trades)
     df.to_csv(path, index=False)
     logger.info("Trade log exported to %s (%d trades)", path, len(trades))
     return path
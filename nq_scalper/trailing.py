@@ -19,6 +19,43 @@ from config import TRAILING_ATR_MULT, USE_SUPERTREND_TRAILING
 logger = logging.getLogger(__name__)
 
 
+def trail_update(stage, trail_stop, entry_price, sl_distance, bar_close,
+                 atr, st_line, st_bullish, trailing_atr_mult, use_st):
+    """One bar of the 3-stage trail on plain scalars; returns (stage, trail_stop).
+
+    Free function so the backtest kernel can compile it with numba;
+    TrailingStop.update wraps it with the config values.
+    """
+    current_profit = bar_close - entry_price
+
+    # Stage 2 transition: profit >= SL × 1.5
+    if stage == 1 and current_profit >= sl_distance * 1.5:
+        stage = 2
+        new_trail = entry_price + sl_distance * 0.5
+        trail_stop = max(trail_stop, new_trail)
+
+    # Stage 3 transition: profit >= SL × 2.0
+    if stage == 2 and current_profit >= sl_distance * 2.0:
+        stage = 3
+
+    # Stage 3: ATR trailing (dynamic)
+    if stage == 3 and not np.isnan(atr):
+        atr_trail = bar_close - atr * trailing_atr_mult
+
+        if use_st and st_bullish and not np.isnan(st_line):
+            st_trail = st_line
+        else:
+            st_trail = atr_trail
+
+        new_trail = max(atr_trail, st_trail)
+        # Never below entry price
+        new_trail = max(new_trail, entry_price)
+        # Only ratchet up
+        trail_stop = max(trail_stop, new_trail)
+
+    return stage, trail_stop
+
+
 class TrailingStop:
     """Manages the 3-stage trailing stop for a LONG runner position."""
 
@@ -40,32 +77,11 @@ class TrailingStop:
         Call this once per bar while the runner position is open.
         The trail stop only ratchets UP, never down.
         """
-        current_profit = bar_close - self.entry_price
-
-        # Stage 2 transition: profit >= SL × 1.5
-        if self.stage == 1 and current_profit >= self.sl_distance * 1.5:
-            self.stage = 2
-            new_trail = self.entry_price + self.sl_distance * 0.5
-            self.trail_stop = max(self.trail_stop, new_trail)
-
-        # Stage 3 transition: profit >= SL × 2.0
-        if self.stage == 2 and current_profit >= self.sl_distance * 2.0:
-            self.stage = 3
-
-        # Stage 3: ATR trailing (dynamic)
-        if self.stage == 3 and not np.isnan(atr):
-            atr_trail = bar_close - atr * TRAILING_ATR_MULT
-
-            if USE_SUPERTREND_TRAILING and st_bullish and not np.isnan(st_line):
-                st_trail = st_line
-            else:
-                st_trail = atr_trail
-
-            new_trail = max(atr_trail, st_trail)
-            # Never below entry price
-            new_trail = max(new_trail, self.entry_price)
-            # Only ratchet up
-            self.trail_stop = max(self.trail_stop, new_trail)
+        self.stage, self.trail_stop = trail_update(
+            self.stage, self.trail_stop, self.entry_price, self.sl_distance,
+            bar_close, atr, st_line, st_bullish,
+            TRAILING_ATR_MULT, USE_SUPERTREND_TRAILING,
+        )
 
     def is_stopped(self, bar_low: float) -> bool:
         """Check if the runner's trailing stop was hit."""